@@ -1,25 +1,41 @@
 import streamlit as st
+import streamlit.logger
 import pandas as pd
-from streamlit_gsheets import GSheetsConnection
+import numpy as np
+from abc import ABC, abstractmethod
 import calendar
-import datetime
-from datetime import datetime, timedelta
-import plotly.graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
+from datetime import date, datetime, timedelta, timezone
 import json
 import time
+import gzip
+import hashlib
+import inspect
+import random
+import threading
+import weakref
+import marshal
+import os
+import queue
+import re
+import sys
+from collections import OrderedDict, deque
+from itertools import count
+from contextlib import contextmanager, nullcontext
+from email.utils import format_datetime, parsedate_to_datetime
+from urllib.parse import parse_qs, urlsplit
 
-# Page configuration
-st.set_page_config(
-    page_title="Schieberl Cabin Reservations",
-    page_icon="🏔️",
-    layout="wide",
-    initial_sidebar_state="expanded"
-)
+# Plotly and the Google Sheets client (gspread, google-auth, requests) are
+# imported where first used: they are most of a cold start, and pages
+# without a figure or stores other than the sheet never need them (see
+# benchmark.py's startup budget). So are the modules only the command line,
+# the SQLite store, the public server or the profiler use.
 
-# Custom CSS for better styling
-st.markdown("""
+# Command-line runs (see export_cli) have no Streamlit runtime; keep its bare-mode warnings quiet
+if __name__ == "__main__" and not st.runtime.exists():
+    streamlit.logger.set_log_level("error")
+
+# Custom CSS for better styling, also used by the static export (see export_public_site)
+PAGE_CSS = """
 <style>
     .main-header {
         font-size: 2.5rem;
@@ -89,89 +105,479 @@ st.markdown("""
         margin-bottom: 1rem;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def setup_page():
+    """Page configuration, styling and session state defaults, set at the start of every rerun"""
+    # Page configuration
+    st.set_page_config(
+        page_title="Schieberl Cabin Reservations",
+        page_icon="🏔️",
+        layout="wide",
+        initial_sidebar_state="expanded"
+    )
+    
+    # Custom CSS for better styling
+    st.markdown(PAGE_CSS, unsafe_allow_html=True)
+    
+    # Initialize session state
+    if 'admin_mode' not in st.session_state:
+        st.session_state.admin_mode = False
+    if 'selected_date' not in st.session_state:
+        st.session_state.selected_date = datetime.now().date()
+    if 'refresh_data' not in st.session_state:
+        st.session_state.refresh_data = 0
+    if 'bulk_generation' not in st.session_state:
+        st.session_state.bulk_generation = 0
+    if 'optimistic_updates' not in st.session_state:
+        st.session_state.optimistic_updates = True
+    if 'profiling' not in st.session_state:
+        st.session_state.profiling = False
+
+# Formats the Google Form writes into the sheet. Values that don't match are
+# parsed individually as a fallback.
+SHEET_DATE_FORMAT = '%m/%d/%Y'
+SHEET_TIMESTAMP_FORMAT = '%m/%d/%Y %H:%M:%S'
+
+# Free-text columns normalized to plain strings ('' for missing values)
+TEXT_COLUMNS = ['Phone Number', 'Email Address', 'Guest Name', 'Notes']
+
+# Compact dtypes of the normalized frame: Arrow-backed text, a small integer
+# guest count and a categorical status over the reservation statuses (plus
+# any other value the sheet holds, see normalize_reservations)
+TEXT_DTYPE = "string[pyarrow]"
+GUEST_COUNT_DTYPE = np.int16
+RESERVATION_STATUSES = ['Pending', 'Approved', 'Denied']
+
+# How dates of the normalized frame are shown
+DISPLAY_DATE_FORMAT = '%Y-%m-%d'
+
+# pandas >= 2 needs format='mixed' to infer a format per value
+_MIXED_FORMAT = {'format': 'mixed'} if int(pd.__version__.split('.')[0]) >= 2 else {}
+
+# Number of normalized sheet versions kept in memory
+NORMALIZED_CACHE_SIZE = 4
+
+# Number of rendered calendar figures kept in memory, shared by all sessions
+FIGURE_CACHE_SIZE = 48
+
+# Number of store query results (status columns, calendar months) kept in memory
+STORE_QUERY_CACHE_SIZE = 32
+
+# Sheet requests: timeout per request (seconds), attempts, and the backoff
+# between attempts (doubling from the base delay up to the maximum, jittered)
+SHEET_REQUEST_TIMEOUT = 20
+SHEET_RETRY_ATTEMPTS = 4
+SHEET_RETRY_BASE_DELAY = 0.5
+SHEET_RETRY_MAX_DELAY = 8
+
+# HTTP statuses worth retrying: timeouts, rate limiting and server errors
+TRANSIENT_STATUS_CODES = {408, 429, 500, 502, 503, 504}
+
+# Seconds between background refreshes of the reservation data, and of no
+# page views after which the refresher stops polling until the next view
+DATA_REFRESH_INTERVAL = 10
+DATA_REFRESH_IDLE_AFTER = 300
 
-# Initialize session state
-if 'admin_mode' not in st.session_state:
-    st.session_state.admin_mode = False
-if 'selected_date' not in st.session_state:
-    st.session_state.selected_date = datetime.now().date()
-if 'refresh_data' not in st.session_state:
-    st.session_state.refresh_data = 0
+# Seconds between checks on background status writes while they are saving
+SYNC_POLL_INTERVAL = 2
 
-def load_google_sheets_data():
+# Sheet row of the first reservation (row 1 holds the column headers)
+SHEET_FIRST_DATA_ROW = 2
+
+# Columns compared to confirm a sheet row still holds the expected reservation
+ROW_IDENTITY_COLUMNS = ['Guest Name', 'Email Address']
+
+# Local SQLite store layout, using the sheet's column names
+SQLITE_COLUMNS = ['Timestamp', 'Guest Name', 'Email Address', 'Phone Number', 'Check-In',
+                  'Check-Out', 'Number of Guests', 'Notes', 'Status', 'Admin Notes']
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS reservations (
+    id INTEGER PRIMARY KEY,
+    "Timestamp" TEXT,
+    "Guest Name" TEXT,
+    "Email Address" TEXT,
+    "Phone Number" TEXT,
+    "Check-In" TEXT,
+    "Check-Out" TEXT,
+    "Number of Guests" INTEGER,
+    "Notes" TEXT,
+    "Status" TEXT NOT NULL DEFAULT 'Pending',
+    "Admin Notes" TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reservations_check_in ON reservations ("Check-In");
+CREATE INDEX IF NOT EXISTS idx_reservations_check_out ON reservations ("Check-Out");
+CREATE INDEX IF NOT EXISTS idx_reservations_status ON reservations ("Status", "Check-In");
+CREATE TABLE IF NOT EXISTS store_meta (version INTEGER NOT NULL);
+INSERT INTO store_meta SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM store_meta);
+CREATE TRIGGER IF NOT EXISTS reservations_inserted AFTER INSERT ON reservations
+BEGIN UPDATE store_meta SET version = version + 1; END;
+CREATE TRIGGER IF NOT EXISTS reservations_updated AFTER UPDATE ON reservations
+BEGIN UPDATE store_meta SET version = version + 1; END;
+CREATE TRIGGER IF NOT EXISTS reservations_deleted AFTER DELETE ON reservations
+BEGIN UPDATE store_meta SET version = version + 1; END;
+"""
+
+# Status a reservation card action moves the reservation to
+ACTION_STATUS = {'approve': 'Approved', 'deny': 'Denied', 'pending': 'Pending'}
+
+# Reruns kept in the profiling history, and functions listed from a cProfile dump
+PROFILE_HISTORY_SIZE = 20
+PROFILE_TOP_FUNCTIONS = 25
+
+# Reservation cards per page in the admin columns
+CARD_PAGE_SIZES = [5, 10, 25, 50]
+
+# Sections rerun on their own as keyed fragments (see fragment); Streamlit
+# versions without them rerun the whole app instead
+KEYED_FRAGMENTS = 'key' in inspect.signature(getattr(st, 'fragment', lambda: None)).parameters
+
+# Admin reservation columns, in display order, with their bulk actions and
+# card order (oldest_first sorts by Check-In ascending)
+STATUS_COLUMNS = {
+    'Pending': {
+        'title': '⏳ Pending Reservations',
+        'css_class': 'pending-column',
+        'empty_message': 'No pending reservations',
+        'oldest_first': True,
+        'bulk_actions': {'Approve': 'Approved', 'Deny': 'Denied'},
+    },
+    'Approved': {
+        'title': '✅ Approved Reservations',
+        'css_class': 'approved-column',
+        'empty_message': 'No approved reservations',
+        'oldest_first': False,
+        'bulk_actions': {'Move to Pending': 'Pending'},
+    },
+    'Denied': {
+        'title': '❌ Denied Reservations',
+        'css_class': 'denied-column',
+        'empty_message': 'No denied reservations',
+        'oldest_first': False,
+        'bulk_actions': {'Approve': 'Approved', 'Move to Pending': 'Pending'},
+    },
+}
+
+def load_google_sheets_data(store=None):
     """
-    Load data from Google Sheets using streamlit-gsheets connection
+    Load reservation data from the configured store (the Google Sheet by
+    default, see get_reservation_store).
+    
+    Only the first load in a process waits on the store; after that the
+    latest snapshot kept fresh by the background refresher is returned right
+    away (see get_data_refresher). If a refresh fails, the last good data is
+    kept (see render_data_health); with nothing loaded yet the run stops with
+    an error rather than showing an empty calendar. Without a Streamlit
+    runtime (see cli) that error is raised instead.
     """
+    store = store or get_reservation_store()
+    health = get_store_health(store.key)
+    
+    if health['df'] is None:
+        try:
+            with profile_phase("Sheet load"):
+                fetch_store_data(store)
+        except Exception as e:
+            # st.stop() does nothing outside a Streamlit run
+            if not st.runtime.exists():
+                raise
+            st.error(f"Error loading data from {store.name}: {str(e)}")
+            st.info(f"Check your {store.name} setup and credentials.")
+            st.stop()
+    
+    # Serve the snapshot now; revalidate it in the background when it's due
+    refresher = get_data_refresher(store, store.key)
+    refresher['last_used'] = time.time()
+    if datetime.now() - health['loaded_at'] > timedelta(seconds=DATA_REFRESH_INTERVAL):
+        refresher['wake'].set()
+    
+    st.session_state.load_timings = health['timings']
+    df = health['df']
+    
+    # Handle empty DataFrame
+    if df.empty:
+        st.warning(f"No data found in {store.name}. Please add some reservation data.")
+    return df
+
+def fetch_store_data(store):
+    """
+    Read and normalize the store's reservations and make them its latest
+    snapshot. A failure is recorded and raised; the previous snapshot stays.
+    """
+    health = get_store_health(store.key)
+    timings = {}
     try:
-        # Create a connection object
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        
-        # Read the Google Sheet data with a caching mechanism
-        df = conn.read(ttl="10s")
-        
-        # Handle empty DataFrame
-        if df.empty:
-            st.warning("No data found in Google Sheets. Please add some reservation data.")
-            return pd.DataFrame()
-        
-        # Convert date columns - handle different possible date formats
-        if 'Check-In' in df.columns:
-            df['Check-In'] = pd.to_datetime(df['Check-In'], errors='coerce').dt.date
-        if 'Check-Out' in df.columns:
-            df['Check-Out'] = pd.to_datetime(df['Check-Out'], errors='coerce').dt.date
-        if 'Timestamp' in df.columns:
-            df['Timestamp'] = pd.to_datetime(df['Timestamp'], errors='coerce')
-        
-        # Convert Number of Guests to numeric and ensure it's displayed as integer
-        if 'Number of Guests' in df.columns:
-            df['Number of Guests'] = pd.to_numeric(df['Number of Guests'], errors='coerce')
-            # Fill any NaN values with 0 and convert to int
-            df['Number of Guests'] = df['Number of Guests'].fillna(0).astype(int)
-        
-        # FIX FOR PHONE NUMBER FORMATTING
-        if 'Phone Number' in df.columns:
-            # Convert all phone numbers to strings and handle NaN values
-            df['Phone Number'] = df['Phone Number'].astype(str)
-            # Replace 'nan' strings with empty strings
-            df['Phone Number'] = df['Phone Number'].replace('nan', '')
-            # Optional: Format phone numbers consistently
-            df['Phone Number'] = df['Phone Number'].apply(format_phone_number)
-        
-        # Also ensure Email Address is string type (in case of similar issues)
-        if 'Email Address' in df.columns:
-            df['Email Address'] = df['Email Address'].astype(str)
-            df['Email Address'] = df['Email Address'].replace('nan', '')
-        
-        # Ensure Guest Name is string type
-        if 'Guest Name' in df.columns:
-            df['Guest Name'] = df['Guest Name'].astype(str)
-            df['Guest Name'] = df['Guest Name'].replace('nan', '')
-        
-        # Ensure Notes is string type
-        if 'Notes' in df.columns:
-            df['Notes'] = df['Notes'].astype(str)
-            df['Notes'] = df['Notes'].replace('nan', '')
-        
-        # Default Status column to 'Pending' if it doesn't exist or has empty values
+        # Read the raw reservation rows
+        with timed(timings, 'Sheet read'):
+            raw_df = store.read()
+        if raw_df.empty:
+            df = pd.DataFrame()
+        else:
+            df, normalize_timings = normalize_reservations_cached(raw_df, store.date_format,
+                                                                  store.timestamp_format)
+            timings.update(normalize_timings)
+            timings['Total'] += timings['Sheet read']
+    except Exception as e:
+        health.update(failed_at=time.time(), error=str(e))
+        raise
+    health.update(df=df, loaded_at=datetime.now(), timings=timings, failed_at=0.0, error=None)
+    return df
+
+@st.cache_resource
+def get_data_refresher(_store, store_key):
+    """
+    Start the background thread that keeps a store's snapshot fresh (one per
+    store and process).
+    
+    It re-reads the store every DATA_REFRESH_INTERVAL seconds while pages are
+    being served, and right away when woken (after a write, or when a page is
+    served a snapshot that is due). It pauses while status writes are still
+    saving so it can't bring back the old statuses, and stops once the store
+    itself is gone.
+    """
+    refresher = {'wake': threading.Event(), 'last_used': time.time()}
+    store_ref = weakref.ref(_store)
+    
+    def refresh_loop():
+        while True:
+            woken = refresher['wake'].wait(DATA_REFRESH_INTERVAL)
+            refresher['wake'].clear()
+            if store_ref() is None:
+                return
+            if not woken and time.time() - refresher['last_used'] > DATA_REFRESH_IDLE_AFTER:
+                continue
+            if status_sync_pending():
+                continue
+            try:
+                # Only held while reading, so the thread doesn't keep the store alive
+                fetch_store_data(store_ref())
+            except Exception:
+                # Recorded in the store health; the last good snapshot stays
+                pass
+    
+    threading.Thread(target=refresh_loop, name=f"refresh-{store_key}", daemon=True).start()
+    return refresher
+
+@st.cache_resource
+def get_store_health_registry():
+    """Process-wide latest snapshot and last failure of each store, by store key"""
+    return {}
+
+def get_store_health(key):
+    """Latest snapshot and last failure of the store with the given key (see ReservationStore.key)"""
+    return get_store_health_registry().setdefault(
+        key, {'df': None, 'loaded_at': None, 'timings': {}, 'failed_at': 0.0, 'error': None}
+    )
+
+def render_data_health(store, slot):
+    """Show in ``slot`` how current the page's data is, warning if the store can't be read"""
+    health = get_store_health(store.key)
+    if health['loaded_at'] is None:
+        return
+    if health['error']:
+        slot.warning(
+            f"⚠️ Couldn't reach {store.name}; showing reservations as of "
+            f"{health['loaded_at']:%b %d, %H:%M:%S}. Retrying shortly."
+        )
+    else:
+        slot.caption(f"🕒 Data as of {health['loaded_at']:%b %d, %H:%M:%S}")
+
+def normalize_reservations(raw_df, date_format=SHEET_DATE_FORMAT,
+                           timestamp_format=SHEET_TIMESTAMP_FORMAT):
+    """
+    Normalize raw sheet data in one vectorized pass, into compact columns:
+    datetime64 dates (at midnight), int16 guest counts, Arrow strings and a
+    categorical Status (see RESERVATION_STATUSES). Blank statuses become
+    Pending; statuses the app doesn't know (say "Cancelled") are kept as they
+    are, so they show in none of the status columns.
+    
+    Returns the normalized DataFrame and the time spent on each column
+    (in seconds), plus a 'Total' entry.
+    """
+    df = raw_df.copy()
+    timings = {}
+    started = time.perf_counter()
+    
+    # Parse date columns in bulk with the declared sheet formats
+    for column, column_format in (('Check-In', date_format),
+                                  ('Check-Out', date_format),
+                                  ('Timestamp', timestamp_format)):
+        if column in df.columns:
+            with timed(timings, column):
+                df[column] = parse_dates(df[column], column_format)
+                if column != 'Timestamp':
+                    df[column] = df[column].dt.normalize()
+    
+    # Convert Number of Guests to numeric and ensure it's displayed as integer
+    if 'Number of Guests' in df.columns:
+        with timed(timings, 'Number of Guests'):
+            guests = pd.to_numeric(df['Number of Guests'], errors='coerce')
+            limit = np.iinfo(GUEST_COUNT_DTYPE).max
+            df['Number of Guests'] = guests.fillna(0).clip(0, limit).astype(GUEST_COUNT_DTYPE)
+    
+    # Convert all text columns to strings in one pass, with '' for missing values
+    text_columns = [col for col in TEXT_COLUMNS if col in df.columns]
+    if text_columns:
+        with timed(timings, 'Text columns'):
+            text = df[text_columns]
+            df[text_columns] = text.where(text.notna(), '').astype(str).replace('nan', '').astype(TEXT_DTYPE)
+    
+    # Format phone numbers consistently
+    if 'Phone Number' in df.columns:
+        with timed(timings, 'Phone Number'):
+            df['Phone Number'] = format_phone_numbers(df['Phone Number'])
+    
+    # Default Status column to 'Pending' if it doesn't exist or is empty
+    with timed(timings, 'Status'):
         if 'Status' not in df.columns:
-            df['Status'] = 'Pending'
+            df['Status'] = pd.Categorical(['Pending'] * len(df), categories=RESERVATION_STATUSES)
         else:
-            # Fill any empty or NaN values in Status column with 'Pending'
-            df['Status'] = df['Status'].fillna('Pending')
-            df['Status'] = df['Status'].replace('', 'Pending')
-            df['Status'] = df['Status'].astype(str)  # Ensure it's string type
-        
-        # Handle any rows with invalid dates
-        if 'Check-In' in df.columns and 'Check-Out' in df.columns:
-            df = df.dropna(subset=['Check-In', 'Check-Out'])
-        
-        return df
+            status = df['Status'].astype(TEXT_DTYPE).str.strip().fillna('')
+            known = status.str.capitalize()
+            status = known.where(known.isin(RESERVATION_STATUSES), status).replace('', 'Pending')
+            other = sorted(status[~status.isin(RESERVATION_STATUSES)].unique())
+            df['Status'] = status.astype(pd.CategoricalDtype(RESERVATION_STATUSES + other))
+    
+    # Handle any rows with invalid dates
+    if 'Check-In' in df.columns and 'Check-Out' in df.columns:
+        df = df.dropna(subset=['Check-In', 'Check-Out'])
+    
+    timings['Total'] = time.perf_counter() - started
+    return df, timings
+
+def new_lru_cache():
+    """Empty LRU cache with hit/miss counters, meant to live in a cache_resource"""
+    return {'entries': OrderedDict(), 'hits': 0, 'misses': 0, 'lock': threading.Lock()}
+
+def lru_get(cache, key):
+    """Look up ``key`` in an LRU cache, counting a hit or a miss. Returns None on a miss."""
+    with cache['lock']:
+        value = cache['entries'].get(key)
+        if value is not None:
+            cache['entries'].move_to_end(key)
+            cache['hits'] += 1
+        else:
+            cache['misses'] += 1
+        return value
+
+def lru_put(cache, key, value, max_size):
+    """Store ``value`` under ``key``, evicting the least recently used entries"""
+    with cache['lock']:
+        cache['entries'][key] = value
+        cache['entries'].move_to_end(key)
+        while len(cache['entries']) > max_size:
+            cache['entries'].popitem(last=False)
+
+def lru_stats(cache):
+    """Hit/miss counts, hit ratio and size of an LRU cache"""
+    with cache['lock']:
+        lookups = cache['hits'] + cache['misses']
+        return {
+            'hits': cache['hits'],
+            'misses': cache['misses'],
+            'entries': len(cache['entries']),
+            'hit_ratio': cache['hits'] / lookups if lookups else 0.0,
+        }
+
+@st.cache_resource
+def get_normalized_cache():
+    """Process-wide LRU of normalized frames, keyed by raw content hash"""
+    return new_lru_cache()
+
+def hash_frame(df):
+    """Content hash of a DataFrame's column names, index and values"""
+    hasher = hashlib.blake2b(digest_size=16)
+    hasher.update(repr(list(df.columns)).encode())
+    hasher.update(pd.util.hash_pandas_object(df, index=True).to_numpy().tobytes())
+    return hasher.hexdigest()
+
+def get_data_version(df):
+    """
+    Return the content version of a DataFrame. Frames produced by
+    normalize_reservations_cached carry their version; any other frame
+    (including ones derived from a cached frame) is hashed.
+    """
+    if df.attrs.get('frame_id') == id(df):
+        return df.attrs['data_version']
+    return hash_frame(df)
+
+def normalize_reservations_cached(raw_df, date_format=SHEET_DATE_FORMAT,
+                                  timestamp_format=SHEET_TIMESTAMP_FORMAT):
+    """
+    Normalize raw sheet data, reusing the result when the raw content hash
+    matches a recently normalized version.
+    
+    The returned DataFrame is shared between reruns and sessions and must be
+    treated as read-only: copy it before modifying.
+    """
+    timings = {}
+    with timed(timings, 'Content hash'):
+        data_version = hash_frame(raw_df)
+    
+    cache = get_normalized_cache()
+    df = lru_get(cache, data_version)
+    if df is None:
+        df, normalize_timings = normalize_reservations(raw_df, date_format, timestamp_format)
+        df.attrs['data_version'] = data_version
+        df.attrs['frame_id'] = id(df)
+        lru_put(cache, data_version, df, NORMALIZED_CACHE_SIZE)
+        timings.update(normalize_timings)
+        timings['Total'] += timings['Content hash']
+    else:
+        timings['Total'] = timings['Content hash']
+    
+    return df, timings
+
+def patch_normalized_cache(cache, df, changes):
+    """
+    Replace a cached normalized frame, and any store snapshot holding it,
+    with a copy whose Status values are patched. ``changes`` maps row keys
+    to the new status.
+    
+    The patched copy gets a new data version so caches derived from the old
+    frame are not reused. Returns the patched frame, or None if ``df`` is
+    neither cached nor a store's snapshot any more.
+    """
+    with cache['lock']:
+        raw_version = next((version for version, cached in cache['entries'].items() if cached is df), None)
+        # Pages are served the latest snapshot of each store; patch it too
+        snapshots = [health for health in get_store_health_registry().values() if health['df'] is df]
+        if raw_version is None and not snapshots:
+            return None
         
-    except Exception as e:
-        st.error(f"Error loading data from Google Sheets: {str(e)}")
-        st.info("Check your Google Sheets setup and credentials.")
-        return pd.DataFrame()
+        patched = df.copy()
+        for row_index, new_status in changes.items():
+            if row_index in patched.index:
+                patched.at[row_index, 'Status'] = new_status
+        cache['patch_count'] = cache.get('patch_count', 0) + 1
+        base_version = raw_version if raw_version is not None else get_data_version(df)
+        patched.attrs['data_version'] = f"{base_version}+{cache['patch_count']}"
+        patched.attrs['frame_id'] = id(patched)
+        if raw_version is not None:
+            cache['entries'][raw_version] = patched
+        for health in snapshots:
+            health['df'] = patched
+        return patched
+
+@contextmanager
+def timed(timings, name):
+    """Record the wall time spent in the block under ``timings[name]``"""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[name] = timings.get(name, 0.0) + time.perf_counter() - started
+
+def parse_dates(values, date_format):
+    """
+    Parse a column of dates in bulk using a declared format, falling back to
+    per-value parsing only for the entries that don't match it
+    """
+    parsed = pd.to_datetime(values, format=date_format, errors='coerce')
+    leftover = parsed.isna() & values.notna() & (values.astype(str).str.strip() != '')
+    if leftover.any():
+        parsed[leftover] = pd.to_datetime(values[leftover], errors='coerce', **_MIXED_FORMAT)
+    return parsed
 
 def format_phone_number(phone):
     """
@@ -194,34 +600,913 @@ def format_phone_number(phone):
         # Return as-is if it doesn't match expected formats
         return str(phone)
 
-def update_reservation_status(df, row_index, new_status):
+def format_phone_numbers(phones):
+    """
+    Vectorized format_phone_number for a Series of phone number strings
+    """
+    digits = phones.str.replace(r'\D', '', regex=True)
+    length = digits.str.len()
+    is_local = length == 10
+    # Handle +1 country code
+    is_us = (length == 11) & digits.str.startswith('1')
+    
+    local = digits.where(is_local, digits.str[1:])
+    formatted = '(' + local.str[:3] + ') ' + local.str[3:6] + '-' + local.str[6:]
+    # Return as-is if it doesn't match expected formats
+    return formatted.where(is_local | is_us, phones)
+
+def update_reservation_status(df, row_index, new_status, optimistic=False):
     """Update reservation status in Google Sheets"""
+    entry = update_reservation_statuses(df, {row_index: new_status}, optimistic)[0]
+    return entry['Updated'], entry['Message']
+
+def update_reservation_statuses(df, changes, optimistic=False):
+    """
+    Apply several status changes to Google Sheets in one batched write.
+    
+    ``changes`` maps row keys to the new status. Returns a per-row report:
+    one dict per requested change with the guest, the new status, whether
+    the row was updated and a message.
+    
+    With ``optimistic`` the cached data is patched right away and the sheet
+    write runs in the background; a failed write is rolled back and shown by
+    render_sync_status.
+    """
+    report = []
+    valid_changes = {}
+    for row_index, new_status in changes.items():
+        known = row_index in df.index
+        entry = {
+            'Row': row_index,
+            'Guest Name': df.at[row_index, 'Guest Name'] if known and 'Guest Name' in df.columns else '',
+            'New Status': new_status,
+            'Updated': False,
+            'Message': '',
+        }
+        if not known:
+            entry['Message'] = "Reservation no longer exists"
+        elif 'Status' in df.columns and df.at[row_index, 'Status'] == new_status:
+            entry['Message'] = f"Already {new_status}"
+        else:
+            valid_changes[row_index] = new_status
+        report.append(entry)
+    
+    # Approvals must not double-book an approved stay or each other
+    approvals = [row for row, status in valid_changes.items() if status == 'Approved']
+    if approvals:
+        blocked = double_bookings(df, approvals, valid_changes)
+        for entry in report:
+            if entry['Row'] in blocked:
+                del valid_changes[entry['Row']]
+                entry['Message'] = f"Overlaps approved stay: {describe_stays(df, blocked[entry['Row']])}"
+    
+    if not valid_changes:
+        return report
+    
+    store = get_reservation_store()
     try:
-        # Create a connection object
-        conn = st.connection("gsheets", type=GSheetsConnection)
-        
-        # Create a copy of the dataframe to modify
-        updated_df = df.copy()
-        
-        # Update the status for the specific row
-        updated_df.at[row_index, 'Status'] = new_status
-        
-        # Update the Google Sheet
-        conn.update(data=updated_df)
+        if optimistic:
+            start_status_sync(store, df, valid_changes)
+            success_message = "Status set to {} (saving in background)"
+        else:
+            store.write_statuses(df, valid_changes)
+            # Show the change now and pick up the written data on the next refresh
+            patch_normalized_cache(get_normalized_cache(), df, valid_changes)
+            get_data_refresher(store, store.key)['wake'].set()
+            success_message = "Status updated to {} successfully!"
         
         # Force data refresh by incrementing the session state counter
         st.session_state.refresh_data += 1
-        
-        return True, f"Status updated to {new_status} successfully!"
+        updated, error = True, None
         
     except Exception as e:
-        return False, f"Error updating Google Sheets: {str(e)}"
+        updated, error = False, f"Error updating {store.name}: {str(e)}"
+    
+    for entry in report:
+        if entry['Row'] in valid_changes:
+            entry['Updated'] = updated
+            entry['Message'] = error or success_message.format(entry['New Status'])
+    return report
+
+def double_bookings(df, approvals, changes):
+    """
+    Approvals that would overlap an approved stay, either one already
+    approved (and not being moved away from Approved by ``changes``) or an
+    earlier approval of the same batch. Returns a dict mapping each blocked
+    row key to the rows it overlaps.
+    """
+    index = build_overlap_index(df, get_data_version(df))
+    start, end = stay_nights(df.loc[approvals])
+    blocked = {}
+    accepted = []
+    for row, row_start, row_end in sorted(zip(approvals, start, end), key=lambda item: item[1]):
+        conflicts = [other for other in overlapping_stays(index, row_start, row_end)
+                     if changes.get(other, 'Approved') == 'Approved']
+        conflicts += [other for other, other_start, other_end in accepted
+                      if other_start < row_end and row_start < other_end]
+        if row_start >= 0 and conflicts:
+            blocked[row] = conflicts
+        else:
+            accepted.append((row, row_start, row_end))
+    return blocked
+
+def write_status_changes(conn, df, changes, rewrite=True):
+    """
+    Write status changes to the sheet, rewriting it only if its layout
+    drifted (see rewrite_status_changes). Without ``rewrite`` a drifted
+    sheet is an error instead.
+    """
+    # Write only the affected Status cells when the sheet still lines up
+    if not write_status_cells(conn, df, changes):
+        if not rewrite:
+            raise RuntimeError("couldn't write single Status cells (the sheet's rows may have moved "
+                               "since it was loaded); reload and try again")
+        rewrite_status_changes(conn, df, changes)
+
+def rewrite_status_changes(conn, df, changes):
+    """
+    Rewrite the whole sheet with status changes made on the loaded ``df``.
+    
+    The sheet has drifted since ``df`` was loaded, so it is read again and
+    only the Status of each changed reservation is set on that fresh copy,
+    found by guest, email and dates wherever its row is now. Everything else
+    is written back as read. Raises without writing if a reservation isn't
+    in the sheet exactly once.
+    """
+    fresh = conn.read(ttl=0)
+    fresh_df, _ = normalize_reservations(fresh)
+    match_columns = [col for col in ROW_IDENTITY_COLUMNS + ['Check-In', 'Check-Out']
+                     if col in df.columns and col in fresh_df.columns]
+    rows = {}
+    for row_key, values in zip(fresh_df.index, zip(*(fresh_df[col].tolist() for col in match_columns))):
+        rows.setdefault(values, []).append(row_key)
+    
+    updated = fresh.copy()
+    if 'Status' not in updated.columns:
+        updated['Status'] = ''
+    for row_index, new_status in changes.items():
+        found = rows.get(tuple(df.at[row_index, col] for col in match_columns), [])
+        if len(found) != 1:
+            guest = df.at[row_index, 'Guest Name'] if 'Guest Name' in df.columns else row_index
+            raise RuntimeError(f"couldn't find the reservation of {guest} in the sheet; reload and try again")
+        updated.at[found[0], 'Status'] = new_status
+    conn.update(data=updated)
+
+@st.cache_resource
+def get_status_sync_jobs():
+    """
+    Process-wide list of background status writes that are saving or failed.
+    
+    One worker thread saves them one at a time, in the order they were made,
+    so a later change to the same row always lands last. An unexpected error
+    fails its job rather than the worker, so no job is left saving forever
+    (which would keep the background refresher paused).
+    """
+    sync = {'jobs': [], 'next_id': 0, 'lock': threading.Lock(), 'queue': queue.Queue()}
+    
+    def save_loop():
+        while True:
+            job, save = sync['queue'].get()
+            try:
+                save()
+            except Exception as e:
+                with sync['lock']:
+                    job['state'] = 'failed'
+                    job['error'] = job['error'] or str(e)
+    
+    threading.Thread(target=save_loop, name="status-sync", daemon=True).start()
+    return sync
+
+def start_status_sync(store, df, changes):
+    """
+    Optimistically apply status changes to the cached data and queue their
+    write to the store (see get_status_sync_jobs).
+    
+    Only the changed cells are written, never a whole frame that may be
+    behind the sheet. A failed write is rolled back row by row on the
+    store's current snapshot.
+    """
+    cache = get_normalized_cache()
+    sync = get_status_sync_jobs()
+    originals = {row_index: df.at[row_index, 'Status'] for row_index in changes}
+    patch_normalized_cache(cache, df, changes)
+    
+    guest_names = df['Guest Name'] if 'Guest Name' in df.columns else pd.Series('', index=df.index)
+    with sync['lock']:
+        job = {
+            'id': sync['next_id'],
+            'summary': ", ".join(f"{guest_names[idx]} → {status}" for idx, status in changes.items()),
+            'state': 'saving',
+            'error': None,
+            'rolled_back': False,
+        }
+        sync['next_id'] += 1
+        sync['jobs'].append(job)
+    
+    def reconcile():
+        try:
+            store.write_statuses(df, changes, rewrite=False)
+        except Exception as e:
+            with sync['lock']:
+                job['error'] = str(e)
+            rolled_back = rollback_status_changes(store, changes, originals)
+            with sync['lock']:
+                job['state'] = 'failed'
+                job['rolled_back'] = rolled_back
+            return
+        
+        # Saved: only now may the refresher read the store again
+        with sync['lock']:
+            sync['jobs'].remove(job)
+        get_data_refresher(store, store.key)['wake'].set()
+    
+    sync['queue'].put((job, reconcile))
+
+def rollback_status_changes(store, changes, originals):
+    """
+    Put the rows of failed status changes back to their ``originals`` in the
+    store's current snapshot, skipping rows changed again since. Returns
+    whether every row matches the sheet again.
+    """
+    current = get_store_health(store.key)['df']
+    if current is None or 'Status' not in current.columns:
+        return False
+    revert = {row: originals[row] for row, status in changes.items()
+              if row in current.index and current.at[row, 'Status'] == status}
+    if not revert:
+        return False
+    patched = patch_normalized_cache(get_normalized_cache(), current, revert)
+    return patched is not None and len(revert) == len(changes)
+
+def status_sync_pending():
+    """Whether any background status write is still saving"""
+    sync = get_status_sync_jobs()
+    with sync['lock']:
+        return any(job['state'] == 'saving' for job in sync['jobs'])
+
+def render_sync_status():
+    """Show background status writes that are still saving or have failed"""
+    sync = get_status_sync_jobs()
+    with sync['lock']:
+        jobs = list(sync['jobs'])
+    
+    saving = [job for job in jobs if job['state'] == 'saving']
+    if saving:
+        st.info(f"⏳ Saving {len(saving)} status change(s)...")
+    
+    for job in jobs:
+        if job['state'] == 'failed':
+            col1, col2 = st.columns([5, 1])
+            with col1:
+                outcome = ("The change was rolled back." if job['rolled_back']
+                           else "Reload the data to see the saved statuses.")
+                st.error(f"⚠️ Could not save {job['summary']}: {job['error']}. {outcome}")
+            with col2:
+                if st.button("Dismiss", key=f"dismiss_sync_{job['id']}", use_container_width=True):
+                    with sync['lock']:
+                        sync['jobs'].remove(job)
+                    st.rerun()
+
+def write_status_cells(conn, df, changes):
+    """
+    Write new Status values straight into their sheet cells.
+    
+    ``changes`` maps row keys (index labels of the loaded DataFrame, i.e. the
+    position of the row below the header) to the new status. Before writing,
+    the header and the target rows are read back in one request to confirm
+    the Status column and each row's identity still match ``df``. Returns
+    False without writing anything if they don't, or if the connection can't
+    address single cells, so the caller can fall back to a full rewrite.
+    """
+    from gspread.utils import rowcol_to_a1
+    
+    # st-gsheets-connection has no public accessor for the gspread worksheet;
+    # its service account client's is private, so the package version is
+    # pinned in requirements.txt and public-sheet clients (without it) fall back
+    select_worksheet = getattr(conn.client, '_select_worksheet', None)
+    if not callable(select_worksheet) or not changes:
+        return False
+    worksheet = select_worksheet()
+    if not (hasattr(worksheet, 'batch_get') and hasattr(worksheet, 'batch_update')):
+        return False
+    
+    sheet_rows = {key: SHEET_FIRST_DATA_ROW + int(key) for key in changes}
+    header, *rows = worksheet.batch_get(
+        ['1:1'] + [f'{row}:{row}' for row in sheet_rows.values()]
+    )
+    header = header[0] if header else []
+    identity_columns = [col for col in ROW_IDENTITY_COLUMNS if col in header and col in df.columns]
+    if 'Status' not in header or not identity_columns:
+        return False
+    
+    # Confirm every target row still holds the reservation we loaded
+    for key, row in zip(changes, rows):
+        cells = row[0] if row else []
+        for column in identity_columns:
+            position = header.index(column)
+            sheet_value = cells[position] if position < len(cells) else ''
+            if str(sheet_value).strip() != str(df.at[key, column]).strip():
+                return False
+    
+    status_column = header.index('Status') + 1
+    worksheet.batch_update([
+        {'range': rowcol_to_a1(sheet_rows[key], status_column), 'values': [[status]]}
+        for key, status in changes.items()
+    ])
+    return True
+
+# Numbers the stores on their own connection (see GSheetsStore.key)
+STORE_IDS = count(1)
+
+
+class ReservationStore(ABC):
+    """
+    Where reservations are read from and status changes are written to.
+    
+    Rows are addressed by a stable row key: the index of the frame returned
+    by read(). The query methods return normalized reservations; this base
+    implementation filters the full normalized frame, stores with an index
+    push them down instead.
+    
+    ``key`` tells stores apart in the process-wide snapshots, refreshers and
+    feeds: stores with the same key must read the same data.
+    """
+    name = "Reservation store"
+    key = name
+    date_format = SHEET_DATE_FORMAT
+    timestamp_format = SHEET_TIMESTAMP_FORMAT
+    
+    @abstractmethod
+    def read(self):
+        """Return the raw reservation rows as a DataFrame"""
+    
+    @abstractmethod
+    def write_statuses(self, df, changes, rewrite=True):
+        """
+        Write status changes (row key -> status) for rows of the loaded
+        ``df``. Without ``rewrite`` only the changed rows may be written.
+        """
+    
+    def reservations_overlapping(self, start, end, statuses=None):
+        """
+        Reservations overlapping the dates ``start`` to ``end`` (inclusive,
+        either may be None for an open range), optionally limited to the
+        given statuses
+        """
+        return filter_reservations(load_google_sheets_data(self), start, end, statuses)
+    
+    def reservations_with_status(self, status):
+        """Reservations with the given status"""
+        return filter_reservations(load_google_sheets_data(self), statuses=[status])
+    
+    def reservation_years(self):
+        """Years from the first check-in to the last check-out (see reservation_years)"""
+        return reservation_years(load_google_sheets_data(self))
+    
+    def data_version(self):
+        """Version of the stored data; changes whenever any reservation changes"""
+        return get_data_version(load_google_sheets_data(self))
+
+
+class GSheetsStore(ReservationStore):
+    """Reservations in the Google Sheet filled by the reservation form"""
+    name = "Google Sheets"
+    
+    def __init__(self, conn=None):
+        self._conn = conn
+        # Stores on the shared connection share one snapshot; any other connection gets its own
+        self.key = self.name if conn is None else f"{self.name} #{next(STORE_IDS)}"
+    
+    @property
+    def conn(self):
+        # Use the shared connection object
+        return self._conn or get_sheet_connection()
+    
+    def read(self):
+        # Read the Google Sheet data fresh; the background refresher paces the reads
+        return with_retries(lambda: self.conn.read(ttl=0))
+    
+    def write_statuses(self, df, changes, rewrite=True):
+        # Rewriting the same Status values is safe to repeat
+        with_retries(lambda: write_status_changes(self.conn, df, changes, rewrite))
+
+
+class SQLiteStore(ReservationStore):
+    """
+    Reservations in a local SQLite database, indexed on Check-In, Check-Out
+    and Status so month and status queries don't scan the whole history.
+    
+    Row keys are the ``id`` primary key. Rows imported from the sheet keep
+    their sheet row key, so with a ``sync_store`` every status change is
+    also written through to the sheet's Status cells. The sheet is never
+    rewritten from the database: it may hold form responses not imported yet.
+    """
+    name = "SQLite"
+    date_format = '%Y-%m-%d'
+    timestamp_format = '%Y-%m-%d %H:%M:%S'
+    
+    def __init__(self, path, sync_store=None):
+        self.path = path
+        self.sync_store = sync_store
+        self.key = f"{self.name}:{os.path.abspath(path)}"
+        with self._connect() as db:
+            db.executescript(SQLITE_SCHEMA)
+    
+    @contextmanager
+    def _connect(self):
+        import sqlite3
+        
+        db = sqlite3.connect(self.path)
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+    
+    def _select(self, where="", params=()):
+        with self._connect() as db:
+            return pd.read_sql_query(
+                f"SELECT * FROM reservations {where} ORDER BY id", db, params=params, index_col='id'
+            )
+    
+    def _query(self, clauses, params):
+        where = "WHERE " + " AND ".join(clauses) if clauses else ""
+        raw = self._select(where, params)
+        df, _ = normalize_reservations(raw, self.date_format, self.timestamp_format)
+        return df
+    
+    def read(self):
+        return self._select()
+    
+    def write_statuses(self, df, changes, rewrite=True):
+        with self._connect() as db:
+            db.executemany(
+                'UPDATE reservations SET "Status" = ? WHERE id = ?',
+                [(new_status, int(row_index)) for row_index, new_status in changes.items()]
+            )
+            # Written through before committing, so a failed sheet write undoes the update
+            if self.sync_store is not None:
+                self.sync_store.write_statuses(df, changes, rewrite=False)
+    
+    def reservations_overlapping(self, start, end, statuses=None):
+        clauses, params = [], []
+        if end is not None:
+            clauses.append('"Check-In" <= ?')
+            params.append(end.strftime(self.date_format))
+        if start is not None:
+            clauses.append('"Check-Out" >= ?')
+            params.append(start.strftime(self.date_format))
+        if statuses:
+            clauses.append(f'"Status" IN ({", ".join("?" * len(statuses))})')
+            params.extend(statuses)
+        return self._query(clauses, params)
+    
+    def reservations_with_status(self, status):
+        return self._query(['"Status" = ?'], [status])
+    
+    def reservation_years(self):
+        with self._connect() as db:
+            first, last = db.execute(
+                'SELECT MIN("Check-In"), MAX("Check-Out") FROM reservations'
+            ).fetchone()
+        if first is None:
+            return reservation_years(pd.DataFrame())
+        return reservation_years(pd.DataFrame({'Check-In': [first], 'Check-Out': [last]}))
+    
+    def data_version(self):
+        # Bumped by triggers on every insert, update and delete
+        with self._connect() as db:
+            version, = db.execute("SELECT version FROM store_meta").fetchone()
+        return f"sqlite:{self.path}:{version}"
+    
+    def import_reservations(self, df):
+        """Replace all rows with a normalized reservation frame, keeping its row keys"""
+        rows = pd.DataFrame(index=df.index)
+        for column in SQLITE_COLUMNS:
+            if column not in df.columns:
+                continue
+            if column in ('Check-In', 'Check-Out'):
+                rows[column] = pd.to_datetime(df[column]).dt.strftime(self.date_format)
+            elif column == 'Timestamp':
+                rows[column] = pd.to_datetime(df[column]).dt.strftime(self.timestamp_format)
+            else:
+                rows[column] = df[column]
+        with self._connect() as db:
+            db.execute("DELETE FROM reservations")
+            rows.to_sql("reservations", db, if_exists="append", index=True, index_label="id")
+        return len(rows)
+
+
+@st.cache_resource
+def get_sheet_connection():
+    """
+    Process-wide Google Sheets connection shared by all reads and writes,
+    with a timeout on every sheet request
+    """
+    from streamlit_gsheets import GSheetsConnection
+    
+    conn = st.connection("gsheets", type=GSheetsConnection)
+    # The gspread client is only reachable through the connection's private
+    # _optional_client (see requirements.txt for the pinned version); without
+    # it, requests keep gspread's default timeout
+    set_timeout = getattr(getattr(conn.client, '_optional_client', None), 'set_timeout', None)
+    if callable(set_timeout):
+        set_timeout(SHEET_REQUEST_TIMEOUT)
+    return conn
+
+def with_retries(operation, attempts=SHEET_RETRY_ATTEMPTS):
+    """
+    Run ``operation``, retrying transient failures (see is_transient_error)
+    with exponential backoff and full jitter. Other errors, and the last
+    failed attempt, are raised.
+    """
+    for attempt in range(attempts):
+        try:
+            return operation()
+        except Exception as e:
+            if attempt == attempts - 1 or not is_transient_error(e):
+                raise
+            delay = min(SHEET_RETRY_MAX_DELAY, SHEET_RETRY_BASE_DELAY * 2 ** attempt)
+            time.sleep(random.uniform(0, delay))
+
+def is_transient_error(error):
+    """Whether a failed sheet request is worth retrying"""
+    import requests
+    from gspread.exceptions import APIError
+    
+    if isinstance(error, APIError):
+        return error.response.status_code in TRANSIENT_STATUS_CODES
+    return isinstance(error, (requests.exceptions.ConnectionError, requests.exceptions.Timeout,
+                              ConnectionError, TimeoutError))
+
+def filter_reservations(df, start=None, end=None, statuses=None):
+    """Filter a normalized frame the way ReservationStore queries do"""
+    if df.empty:
+        return df
+    mask = pd.Series(True, index=df.index)
+    if end is not None:
+        mask &= df['Check-In'] <= pd.Timestamp(end)
+    if start is not None:
+        mask &= df['Check-Out'] >= pd.Timestamp(start)
+    if statuses:
+        mask &= df['Status'].isin(statuses)
+    return df[mask]
+
+def reservation_years(df):
+    """Years from the first check-in to the last check-out, always including this year"""
+    this_year = datetime.now().year
+    if df.empty or 'Check-In' not in df.columns or 'Check-Out' not in df.columns:
+        return [this_year]
+    first = pd.to_datetime(df['Check-In'], errors='coerce').min()
+    last = pd.to_datetime(df['Check-Out'], errors='coerce').max()
+    first_year = min(first.year, this_year) if pd.notna(first) else this_year
+    last_year = max(last.year, this_year) if pd.notna(last) else this_year
+    return list(range(first_year, last_year + 1))
+
+@st.cache_resource
+def get_store_query_cache():
+    """Process-wide LRU of store query results"""
+    return new_lru_cache()
+
+def query_store(store, query, *args):
+    """
+    Run a ReservationStore query (e.g. ``'reservations_with_status'``),
+    reusing its result for all sessions until the store's data changes.
+    Frames returned carry their own data version (see get_data_version) and
+    must not be modified.
+    
+    While background status writes are saving, the snapshot is ahead of the
+    store (see start_status_sync), so the query filters the snapshot instead.
+    """
+    if status_sync_pending():
+        run = getattr(ReservationStore, query)
+        data_version = get_data_version(load_google_sheets_data(store))
+    else:
+        run = getattr(type(store), query)
+        data_version = store.data_version()
+    
+    cache = get_store_query_cache()
+    key = (store.key, data_version, query, args)
+    result = lru_get(cache, key)
+    if result is None:
+        result = run(store, *args)
+        if isinstance(result, pd.DataFrame):
+            # Never tag a frame shared with the snapshot
+            result = result.copy(deep=False)
+            result.attrs['data_version'] = f"{data_version}:{query}{args}"
+            result.attrs['frame_id'] = id(result)
+        lru_put(cache, key, result, STORE_QUERY_CACHE_SIZE)
+    return result
+
+def month_range(first_month, first_year, num_months):
+    """First and last date of ``num_months`` consecutive months"""
+    last_month = (first_month - 1 + num_months - 1) % 12 + 1
+    last_year = first_year + (first_month - 1 + num_months - 1) // 12
+    return (date(first_year, first_month, 1),
+            date(last_year, last_month, calendar.monthrange(last_year, last_month)[1]))
+
+@st.cache_resource
+def get_reservation_store():
+    """
+    Create the reservation store configured in the ``[storage]`` secrets
+    section. Defaults to the Google Sheet; ``backend = "sqlite"`` uses a
+    local database at ``path``, with ``sync_sheet = true`` to keep writing
+    status changes through to the sheet.
+    """
+    try:
+        config = st.secrets.get("storage", {})
+    except FileNotFoundError:
+        config = {}
+    if config.get("backend", "gsheets") == "sqlite":
+        sync_store = GSheetsStore() if config.get("sync_sheet", False) else None
+        return SQLiteStore(config.get("path", "reservations.db"), sync_store)
+    return GSheetsStore()
+
+# Occupancy index codes. Status codes double as the priority used when
+# reservations overlap: an approved stay always wins the day.
+STATUS_NONE, STATUS_APPROVED, STATUS_PENDING, STATUS_OTHER = 0, 1, 2, 3
+POSITION_NONE, POSITION_START, POSITION_MIDDLE, POSITION_END, POSITION_SINGLE = range(5)
+
+# Heatmap value for each status code (available, approved, pending, denied)
+STATUS_HEAT = np.array([0, 1, 0.5, 0.2])
+CALENDAR_COLORSCALE = [[0, '#f3f4f6'], [0.2, '#fee2e2'], [0.5, '#fef3c7'], [1, '#d1fae5']]
+
+# Text color and weight per status code (available, approved, pending, denied)
+STATUS_TEXT_STYLES = [('#374151', 'normal'), ('#065f46', 'bold'), ('#92400e', 'bold'), ('#991b1b', 'bold')]
+WEEKDAY_LABELS = ['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']
+
+# Upcoming reservations shown at first and added by each "Show more"
+UPCOMING_PAGE_SIZE = 10
+
+# How far ahead the upcoming reservations list looks, in days (None: no limit)
+UPCOMING_HORIZONS = {"Next 30 days": 30, "Next 90 days": 90, "Next 12 months": 365, "All upcoming": None}
+
+# Columns of approved stays kept in the public availability snapshot
+PUBLIC_COLUMNS = ['Check-In', 'Check-Out', 'Guest Name', 'Number of Guests']
+
+# Calendar view choices and how many months they show (None: user picks)
+CALENDAR_SPANS = {"Month": 1, "Season": None, "Full year": 12}
+
+
+@st.cache_data(show_spinner=False, max_entries=NORMALIZED_CACHE_SIZE)
+def build_occupancy_index(_df, data_version):
+    """
+    Expand every reservation into a day-indexed occupancy index.
+
+    Returns a dict with the first indexed date (``origin``) and three arrays
+    with one entry per day from ``origin``: the row position of the
+    reservation covering that day (-1 if free), its status code and its
+    start/middle/end/single position code.
+    
+    Cached per ``data_version`` (see get_data_version), so the index is built
+    once per data load rather than on every rerun.
+    """
+    index = {
+        'origin': None,
+        'reservation': np.empty(0, dtype=np.int64),
+        'status': np.empty(0, dtype=np.int8),
+        'position': np.empty(0, dtype=np.int8),
+    }
+    df = _df
+    if df.empty or 'Check-In' not in df.columns or 'Check-Out' not in df.columns:
+        return index
+    
+    check_in = pd.to_datetime(df['Check-In'], errors='coerce').to_numpy(dtype='datetime64[D]')
+    check_out = pd.to_datetime(df['Check-Out'], errors='coerce').to_numpy(dtype='datetime64[D]')
+    valid = ~(np.isnat(check_in) | np.isnat(check_out)) & (check_out >= check_in)
+    rows = np.flatnonzero(valid)
+    if len(rows) == 0:
+        return index
+    
+    # Status code per row
+    if 'Status' in df.columns:
+        row_status = np.full(len(df), STATUS_OTHER, dtype=np.int8)
+        row_status[df['Status'].eq('Approved').to_numpy()] = STATUS_APPROVED
+        row_status[df['Status'].eq('Pending').to_numpy()] = STATUS_PENDING
+    else:
+        row_status = np.full(len(df), STATUS_PENDING, dtype=np.int8)
+    
+    # Day offsets of every stay relative to the earliest check-in
+    origin = check_in[rows].min()
+    start = (check_in[rows] - origin).astype(np.int64)
+    end = (check_out[rows] - origin).astype(np.int64)
+    span = int(end.max()) + 1
+    
+    # Vectorized interval expansion: one entry per (reservation, day)
+    lengths = end - start + 1
+    expanded_rows = np.repeat(rows, lengths)
+    first = np.repeat(np.cumsum(lengths) - lengths, lengths)
+    expanded_days = np.arange(len(expanded_rows)) - first + np.repeat(start, lengths)
+    
+    # Pick one reservation per day: best status first, then sheet order
+    priority = row_status.astype(np.int64) * len(df) + np.arange(len(df))
+    winner = np.full(span, np.iinfo(np.int64).max, dtype=np.int64)
+    np.minimum.at(winner, expanded_days, priority[expanded_rows])
+    occupied = winner != np.iinfo(np.int64).max
+    reservation = np.where(occupied, winner % len(df), -1)
+    
+    # Position of each day within its reservation
+    row_start = np.zeros(len(df), dtype=np.int64)
+    row_end = np.zeros(len(df), dtype=np.int64)
+    row_start[rows] = start
+    row_end[rows] = end
+    days = np.arange(span)
+    res = np.where(occupied, reservation, 0)
+    is_start = days == row_start[res]
+    is_end = days == row_end[res]
+    position = np.select(
+        [is_start & is_end, is_start, is_end],
+        [POSITION_SINGLE, POSITION_START, POSITION_END],
+        POSITION_MIDDLE
+    ).astype(np.int8)
+    position[~occupied] = POSITION_NONE
+    
+    index['origin'] = origin
+    index['reservation'] = reservation
+    index['status'] = np.where(occupied, row_status[res], STATUS_NONE).astype(np.int8)
+    index['position'] = position
+    return index
+
+
+def occupancy_window(index, first_day, num_days):
+    """
+    Look up ``num_days`` consecutive days starting at ``first_day`` in an
+    occupancy index. Days outside the indexed range are reported as free.
+    """
+    reservation = np.full(num_days, -1, dtype=np.int64)
+    status = np.zeros(num_days, dtype=np.int8)
+    position = np.zeros(num_days, dtype=np.int8)
+    if index['origin'] is None:
+        return reservation, status, position
+    
+    offset = int((np.datetime64(first_day, 'D') - index['origin']).astype(np.int64))
+    lo, hi = max(offset, 0), min(offset + num_days, len(index['reservation']))
+    if lo < hi:
+        reservation[lo - offset:hi - offset] = index['reservation'][lo:hi]
+        status[lo - offset:hi - offset] = index['status'][lo:hi]
+        position[lo - offset:hi - offset] = index['position'][lo:hi]
+    return reservation, status, position
+
+@st.cache_data(show_spinner=False, max_entries=NORMALIZED_CACHE_SIZE)
+def build_overlap_index(_df, data_version):
+    """
+    Sorted interval index of the approved stays, for overlap queries.
+    
+    Stays are the nights from Check-In up to (not including) Check-Out, so a
+    check-out and a check-in on the same day do not overlap; a stay with no
+    nights blocks its check-in night. Returns a dict of day-number arrays
+    sorted by start, the running maximum of the ends, the row keys and the
+    longest stay.
+    
+    Cached per ``data_version`` (see get_data_version).
+    """
+    index = {
+        'start': np.empty(0, dtype=np.int64),
+        'end': np.empty(0, dtype=np.int64),
+        'max_end': np.empty(0, dtype=np.int64),
+        'rows': np.empty(0, dtype=object),
+        'max_length': 0,
+    }
+    df = _df
+    if df.empty or not {'Check-In', 'Check-Out', 'Status'}.issubset(df.columns):
+        return index
+    
+    approved = df[df['Status'] == 'Approved']
+    start, end = stay_nights(approved)
+    valid = start >= 0
+    order = np.argsort(start[valid], kind='stable')
+    index['start'] = start[valid][order]
+    index['end'] = end[valid][order]
+    index['max_end'] = np.maximum.accumulate(index['end']) if len(order) else index['end']
+    index['rows'] = approved.index.to_numpy(dtype=object)[valid][order]
+    index['max_length'] = int((index['end'] - index['start']).max()) if len(order) else 0
+    return index
+
+def stay_nights(df):
+    """
+    Night intervals [start, end) of the stays in ``df`` as day numbers.
+    Rows with missing or reversed dates get -1.
+    """
+    check_in = pd.to_datetime(df['Check-In'], errors='coerce').to_numpy(dtype='datetime64[D]')
+    check_out = pd.to_datetime(df['Check-Out'], errors='coerce').to_numpy(dtype='datetime64[D]')
+    invalid = np.isnat(check_in) | np.isnat(check_out) | (check_out < check_in)
+    start = np.where(invalid, -1, check_in.astype(np.int64))
+    end = np.where(invalid, -1, np.maximum(check_out.astype(np.int64), start + 1))
+    return start, end
+
+def overlapping_stays(index, start, end):
+    """
+    Row keys of the indexed stays sharing a night with [start, end).
+    
+    Whether anything overlaps is answered in logarithmic time: only stays
+    starting before ``end`` can overlap, and one of them does exactly when
+    the largest end among them is past ``start``. The matching rows are only
+    collected when there is a conflict, among the stays starting less than
+    the longest stay before ``start``.
+    """
+    candidates = np.searchsorted(index['start'], end, side='left')
+    if candidates == 0 or index['max_end'][candidates - 1] <= start:
+        return []
+    first = np.searchsorted(index['start'], start - index['max_length'], side='right')
+    window = slice(first, candidates)
+    return list(index['rows'][window][index['end'][window] > start])
+
+def reservation_conflicts(df, index):
+    """
+    Reservations not approved yet that overlap an approved stay.
+    
+    Checks all of them against the overlap index at once (a binary search
+    per reservation, O(n log n) overall). Returns the row keys of the
+    conflicting reservations; see conflicting_stays for what they overlap.
+    """
+    pending = df[df['Status'] != 'Approved'] if 'Status' in df.columns else df.iloc[:0]
+    if pending.empty or len(index['start']) == 0:
+        return pending.index[:0]
+    
+    start, end = stay_nights(pending)
+    candidates = np.searchsorted(index['start'], end, side='left')
+    max_end = np.concatenate(([np.iinfo(np.int64).min], index['max_end']))[candidates]
+    return pending.index[(start >= 0) & (max_end > start)]
+
+@st.cache_data(show_spinner=False, max_entries=NORMALIZED_CACHE_SIZE)
+def build_reservation_conflicts(_df, data_version):
+    """The reservation_conflicts of a data version, shared by the admin sections using them"""
+    return reservation_conflicts(_df, build_overlap_index(_df, data_version))
+
+def conflicting_stays(df, index, row):
+    """Row keys of the approved stays overlapping the reservation ``row``"""
+    start, end = stay_nights(df.loc[[row]])
+    return overlapping_stays(index, start[0], end[0]) if start[0] >= 0 else []
+
+def describe_stays(df, rows):
+    """Short 'guest (check-in → check-out)' labels for conflict messages"""
+    return ", ".join(f"{df.at[row, 'Guest Name']} ({df.at[row, 'Check-In']:{DISPLAY_DATE_FORMAT}} → "
+                     f"{df.at[row, 'Check-Out']:{DISPLAY_DATE_FORMAT}})" for row in rows)
+
+def get_public_availability(store):
+    """
+    Return the public availability snapshot for the store's current data
+    version, building it once per version for all sessions
+    """
+    return build_public_availability(store, store.data_version())
+
+@st.cache_resource(max_entries=NORMALIZED_CACHE_SIZE, show_spinner=False)
+def build_public_availability(_store, data_version):
+    """
+    Compact snapshot of everything the public page shows:
+    
+    - ``years``: per-year byte arrays (one entry per day from Jan 1) of booked
+      days (``booked``) and start/middle/end/single markers (``marker``)
+    - ``upcoming``: approved stays with only the columns the public list shows
+    
+    Shared by all sessions as a cached resource; must not be modified.
+    """
+    approved = _store.reservations_with_status('Approved')
+    snapshot = {'data_version': data_version, 'years': {}, 'upcoming': pd.DataFrame()}
+    if 'Check-In' not in approved.columns:
+        return snapshot
+    
+    index = build_occupancy_index(approved, get_data_version(approved))
+    for year in reservation_years(approved):
+        num_days = 366 if calendar.isleap(year) else 365
+        _, status, position = occupancy_window(index, date(year, 1, 1), num_days)
+        booked = status == STATUS_APPROVED
+        snapshot['years'][year] = {
+            'booked': booked.astype(np.uint8),
+            'marker': np.where(booked, position, POSITION_NONE).astype(np.int8),
+        }
+    
+    columns = [col for col in PUBLIC_COLUMNS if col in approved.columns]
+    snapshot['upcoming'] = approved[columns].sort_values('Check-In').reset_index(drop=True)
+    return snapshot
+
+def availability_window(snapshot, first_day, num_days):
+    """
+    Look up ``num_days`` consecutive days in a public availability snapshot.
+    Returns status and position codes like occupancy_window.
+    """
+    booked = np.zeros(num_days, dtype=np.uint8)
+    marker = np.zeros(num_days, dtype=np.int8)
+    last_day = first_day + timedelta(days=num_days - 1)
+    for year in range(first_day.year, last_day.year + 1):
+        arrays = snapshot['years'].get(year)
+        if arrays is None:
+            continue
+        year_start = date(year, 1, 1)
+        lo = max((first_day - year_start).days, 0)
+        hi = min((last_day - year_start).days + 1, len(arrays['booked']))
+        offset = (year_start - first_day).days
+        booked[lo + offset:hi + offset] = arrays['booked'][lo:hi]
+        marker[lo + offset:hi + offset] = arrays['marker'][lo:hi]
+    status = np.where(booked == 1, STATUS_APPROVED, STATUS_NONE).astype(np.int8)
+    return status, marker
 
 def create_calendar_view(df, selected_month, selected_year, is_admin=False):
     """Create a calendar view using Plotly with outlined reservation indicators"""
     
-    # Check if DataFrame is empty or missing required columns
-    if df.empty:
+    # Check if there is no data at all or required columns are missing. A
+    # query result with no rows is just a month without reservations.
+    if df.empty and len(df.columns) == 0:
         return create_empty_calendar(selected_month, selected_year)
     
     required_columns = ['Check-In', 'Check-Out', 'Guest Name', 'Status', 'Number of Guests']
@@ -232,172 +1517,94 @@ def create_calendar_view(df, selected_month, selected_year, is_admin=False):
         st.write("Available columns:", list(df.columns))
         return create_empty_calendar(selected_month, selected_year)
     
-    # Filter reservations to only those that overlap with the selected month
-    month_start = datetime(selected_year, selected_month, 1).date()
-    if selected_month == 12:
-        month_end = datetime(selected_year + 1, 1, 1).date() - timedelta(days=1)
-    else:
-        month_end = datetime(selected_year, selected_month + 1, 1).date() - timedelta(days=1)
-    
-    # Filter reservations that overlap with this month
-    month_reservations = df[
-        (df['Check-In'] <= month_end) & (df['Check-Out'] >= month_start)
-    ].copy()
-    
-    # Create calendar data
-    cal = calendar.monthcalendar(selected_year, selected_month)
-    
-    # Prepare data for heatmap
+    # Look up every day of the month in the shared occupancy index
     days_in_month = calendar.monthrange(selected_year, selected_month)[1]
-    calendar_data = []
+    reservation, status, position = occupancy_window(
+        build_occupancy_index(df, get_data_version(df)), date(selected_year, selected_month, 1), days_in_month
+    )
     
-    for week_num, week in enumerate(cal):
-        for day_num, day in enumerate(week):
-            if day == 0:
-                calendar_data.append([week_num, day_num, 0, "", "", ""])
-            else:
-                date = datetime(selected_year, selected_month, day).date()
-                
-                # Check if there's a reservation for this date in the filtered data
-                reservation = None
-                reservation_position = ""  # "start", "middle", "end", or "single"
-                
-                for _, row in month_reservations.iterrows():
-                    if row['Check-In'] <= date <= row['Check-Out']:
-                        reservation = row
-                        
-                        # Determine position in reservation
-                        if row['Check-In'] == date and row['Check-Out'] == date:
-                            reservation_position = "single"
-                        elif row['Check-In'] == date:
-                            reservation_position = "start"
-                        elif row['Check-Out'] == date:
-                            reservation_position = "end"
-                        else:
-                            reservation_position = "middle"
-                        break
-                
-                if reservation is not None:
-                    if is_admin:
-                        # Admin view: show all reservation statuses with full details
-                        if 'Status' in reservation:
-                            status_color = 1 if reservation['Status'] == 'Approved' else 0.5 if reservation['Status'] == 'Pending' else 0.2
-                        else:
-                            status_color = 0.5  # Default to pending if no status
-                        # Format number of guests as integer
-                        guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
-                        hover_text = f"Date: {date}<br>Guest: {reservation['Guest Name']}<br>Status: {reservation.get('Status', 'Pending')}<br>Party: {guest_count} people"
-                        
-                        # Create day text
-                        guest_name_short = reservation['Guest Name'][:6] + "..." if len(reservation['Guest Name']) > 6 else reservation['Guest Name']
-                        day_text = f"{day}<br>{guest_name_short}"
-                    else:
-                        # Public view: only show approved reservations without details
-                        if 'Status' in reservation and reservation['Status'] == 'Approved':
-                            status_color = 1  # Green for approved
-                            hover_text = f"Date: {date}<br>Reserved"  # No guest details
-                            day_text = str(day)
-                        else:
-                            # Don't show pending or denied reservations in public view
-                            status_color = 0
-                            hover_text = f"Date: {date}<br>Available"
-                            day_text = str(day)
-                            reservation_position = ""
-                else:
-                    status_color = 0
-                    hover_text = f"Date: {date}<br>Available"
-                    day_text = str(day)
-                
-                calendar_data.append([week_num, day_num, status_color, hover_text, day_text, reservation_position])
+    # Public view: only show approved reservations without details
+    if not is_admin:
+        hidden = status != STATUS_APPROVED
+        status = np.where(hidden, STATUS_NONE, status)
+        position = np.where(hidden, POSITION_NONE, position)
+        return calendar_figure(selected_month, selected_year, status, position)
+    
+    # Admin view: show the guest name on reserved days
+    day_text = np.arange(1, days_in_month + 1).astype(str).astype(object)
+    guest_names = df['Guest Name'].astype(str).to_numpy(dtype=object)
+    for day in np.flatnonzero(status != STATUS_NONE):
+        name = guest_names[reservation[day]]
+        name_short = name[:6] + "..." if len(name) > 6 else name
+        day_text[day] = f"{day + 1}<br>{name_short}"
+    
+    return calendar_figure(selected_month, selected_year, status, position, day_text)
+
+def month_grid(selected_month, selected_year, status, position):
+    """
+    Lay per-day status and position codes (one entry per day of the month)
+    out on the month's week grid. Returns the day numbers (0 for padding
+    days) and the status and position codes of each grid cell.
+    """
+    grid = np.array(calendar.monthcalendar(selected_year, selected_month))
+    in_month = grid > 0
+    day_idx = np.where(in_month, grid - 1, 0)
+    status_grid = np.where(in_month, status[day_idx], STATUS_NONE)
+    position_grid = np.where(in_month, position[day_idx], POSITION_NONE)
+    return grid, status_grid, position_grid
+
+def calendar_figure(selected_month, selected_year, status, position, day_text=None):
+    """
+    Build the Plotly month calendar from per-day status and position codes
+    (one entry per day of the month). ``day_text`` optionally replaces the
+    plain day numbers.
+    """
+    import plotly.graph_objects as go
     
-    # Convert to DataFrame
-    cal_df = pd.DataFrame(calendar_data, columns=['week', 'day', 'status', 'hover', 'text', 'position'])
+    grid, status_grid, position_grid = month_grid(selected_month, selected_year, status, position)
+    in_month = grid > 0
+    text_grid = grid.astype(str) if day_text is None else day_text[np.where(in_month, grid - 1, 0)]
     
     # Create heatmap with no interactivity
     fig = go.Figure(data=go.Heatmap(
-        z=cal_df['status'].values.reshape(len(cal), 7),
-        x=['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'],
-        y=[f'Week {i+1}' for i in range(len(cal))],
-        colorscale=[[0, '#f3f4f6'], [0.2, '#fee2e2'], [0.5, '#fef3c7'], [1, '#d1fae5']],
+        z=STATUS_HEAT[status_grid],
+        x=WEEKDAY_LABELS,
+        y=[f'Week {i+1}' for i in range(len(grid))],
+        colorscale=CALENDAR_COLORSCALE,
         showscale=False,
         hoverinfo='skip'  # Disable hover
     ))
     
     # Add day numbers as annotations
     annotations = []
-    for i in range(len(cal)):
-        for j in range(7):
-            if cal[i][j] != 0:
-                day_text = cal_df.iloc[i*7+j]['text']
-                position = cal_df.iloc[i*7+j]['position']
-                
-                # Determine text color based on status
-                status = cal_df.iloc[i*7+j]['status']
-                if status > 0.8:  # Approved
-                    text_color = '#065f46'  # Dark green
-                    font_weight = 'bold'
-                elif status > 0.3:  # Pending
-                    text_color = '#92400e'  # Dark yellow/orange
-                    font_weight = 'bold'
-                elif status > 0.1:  # Denied
-                    text_color = '#991b1b'  # Dark red
-                    font_weight = 'bold'
-                else:  # Available
-                    text_color = '#374151'  # Dark gray
-                    font_weight = 'normal'
-                
-                # Add text annotation
-                annotations.append(
-                    dict(
-                        x=j, y=i,
-                        text=day_text,
-                        showarrow=False,
-                        font=dict(
-                            color=text_color, 
-                            size=10,
-                            weight=font_weight
-                        ),
-                        xanchor='center',
-                        yanchor='middle'
-                    )
-                )
+    for i, j in zip(*np.nonzero(in_month)):
+        text_color, font_weight = STATUS_TEXT_STYLES[status_grid[i, j]]
+        annotations.append(
+            dict(
+                x=int(j), y=int(i),
+                text=text_grid[i, j],
+                showarrow=False,
+                font=dict(
+                    color=text_color, 
+                    size=10,
+                    weight=font_weight
+                ),
+                xanchor='center',
+                yanchor='middle'
+            )
+        )
     
     # Add outline shapes for reservation boundaries
     shapes = []
-    for i in range(len(cal)):
-        for j in range(7):
-            if cal[i][j] != 0:
-                position = cal_df.iloc[i*7+j]['position']
-                status = cal_df.iloc[i*7+j]['status']
-                
-                if position and status > 0:  # Only add outlines for reserved days
-                    # Determine border style based on position
-                    if position == "start":
-                        # Thick left border
-                        shapes.append(dict(
-                            type="line",
-                            x0=j-0.5, y0=i-0.5, x1=j-0.5, y1=i+0.5,
-                            line=dict(color="black", width=4)
-                        ))
-                    elif position == "end":
-                        # Thick right border
-                        shapes.append(dict(
-                            type="line",
-                            x0=j+0.5, y0=i-0.5, x1=j+0.5, y1=i+0.5,
-                            line=dict(color="black", width=4)
-                        ))
-                    elif position == "single":
-                        # Thick left and right borders
-                        shapes.append(dict(
-                            type="line",
-                            x0=j-0.5, y0=i-0.5, x1=j-0.5, y1=i+0.5,
-                            line=dict(color="black", width=4)
-                        ))
-                        shapes.append(dict(
-                            type="line",
-                            x0=j+0.5, y0=i-0.5, x1=j+0.5, y1=i+0.5,
-                            line=dict(color="black", width=4)
-                        ))
+    left_edges = (position_grid == POSITION_START) | (position_grid == POSITION_SINGLE)
+    right_edges = (position_grid == POSITION_END) | (position_grid == POSITION_SINGLE)
+    for edges, dx in ((left_edges, -0.5), (right_edges, 0.5)):
+        for i, j in zip(*np.nonzero(edges & (status_grid != STATUS_NONE))):
+            shapes.append(dict(
+                type="line",
+                x0=int(j)+dx, y0=int(i)-0.5, x1=int(j)+dx, y1=int(i)+0.5,
+                line=dict(color="black", width=4)
+            ))
     
     fig.update_layout(
         annotations=annotations,
@@ -419,302 +1626,152 @@ def create_calendar_view(df, selected_month, selected_year, is_admin=False):
     return fig
 
 
-def admin_panel(df):
-    """Enhanced admin panel with three-column layout for reservation management"""
-    st.header("Admin Panel")
-    
-    # Check if DataFrame is empty
-    if df.empty:
-        st.warning("No reservation data available. Please check your Google Sheets connection.")
-        return
-    
-    # Check for required columns
-    required_columns = ['Status', 'Guest Name', 'Email Address', 'Phone Number', 'Check-In', 'Check-Out', 'Number of Guests', 'Notes']
-    missing_columns = [col for col in required_columns if col not in df.columns]
-    
-    if missing_columns:
-        st.error(f"Missing required columns: {missing_columns}")
-        st.write("Available columns:", list(df.columns))
-        return
-    
-    # Summary metrics
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        total_reservations = len(df)
-        st.metric("Total Reservations", total_reservations)
-    
-    with col2:
-        pending_count = len(df[df['Status'] == 'Pending'])
-        st.metric("Pending Approval", pending_count)
-    
-    with col3:
-        approved_count = len(df[df['Status'] == 'Approved'])
-        st.metric("Approved", approved_count)
-    
-    with col4:
-        denied_count = len(df[df['Status'] == 'Denied'])
-        st.metric("Denied", denied_count)
-    
-    st.divider()
-    
-    # Admin Calendar Section
-    st.subheader("📅 Admin Calendar")
-    
-    # Calendar controls
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        admin_selected_month = st.selectbox("Month", 
-                                           options=list(range(1, 13)),
-                                           format_func=lambda x: calendar.month_name[x],
-                                           index=datetime.now().month - 1,
-                                           key="admin_month_select")
-    
-    with col2:
-        admin_selected_year = st.selectbox("Year", 
-                                         options=list(range(2025, 2028)),
-                                         index=0,
-                                         key="admin_year_select")
-    
-    # Display admin calendar
-    admin_calendar_fig = create_calendar_view(df, admin_selected_month, admin_selected_year, is_admin=True)
-    st.plotly_chart(admin_calendar_fig, use_container_width=True)
-    
-    # Enhanced legend for admin calendar
-    st.markdown("""
-    **Legend:**
-    - 🟢 Green: Approved reservation
-    - 🟡 Yellow: Pending approval  
-    - 🔴 Red: Denied reservation
-    - ⚪ White: Available
-    
-    **Reservation Indicators:**
-    - `||Day` : Reservation starts on this day
-    - `Day||` : Reservation ends on this day
-    - `||Day||` : Single-day reservation
-    - `Day` : Middle of multi-day reservation
-    """)
-    
-    st.divider()
-    
-    # Three-column reservation management
-    st.subheader("📋 Reservation Management")
-    
-    # Filter reservations by status using fresh data
-    pending_reservations = df[df['Status'] == 'Pending'].copy()
-    approved_reservations = df[df['Status'] == 'Approved'].copy()
-    denied_reservations = df[df['Status'] == 'Denied'].copy()
+@st.cache_resource
+def get_figure_cache():
+    """Process-wide LRU of rendered calendar figures"""
+    return new_lru_cache()
+
+def cached_calendar_view(df, selected_month, selected_year, is_admin=False):
+    """
+    create_calendar_view, reusing the figure already built for the same
+    month, view mode and data version. Figures are shared by all sessions and
+    must not be modified.
+    """
+    cache = get_figure_cache()
+    key = (selected_year, selected_month, is_admin, get_data_version(df))
+    fig = lru_get(cache, key)
+    if fig is None:
+        fig = create_calendar_view(df, selected_month, selected_year, is_admin)
+        lru_put(cache, key, fig, FIGURE_CACHE_SIZE)
+    return fig
+
+def cached_public_calendar(snapshot, first_month, first_year, num_months=1):
+    """
+    Public calendar (one month, a season or a full year) rendered from the
+    availability snapshot only, cached per snapshot version
+    """
+    cache = get_figure_cache()
+    key = ('public', first_year, first_month, num_months, snapshot['data_version'])
+    fig = lru_get(cache, key)
+    if fig is None:
+        range_start, range_end = month_range(first_month, first_year, num_months)
+        status, position = availability_window(snapshot, range_start, (range_end - range_start).days + 1)
+        if num_months == 1:
+            fig = calendar_figure(first_month, first_year, status, position)
+        else:
+            fig = multi_month_figure(first_month, first_year, num_months, status, position)
+        lru_put(cache, key, fig, FIGURE_CACHE_SIZE)
+    return fig
+
+def cached_multi_month_view(df, first_month, first_year, num_months, is_admin=False):
+    """create_multi_month_view, cached like cached_calendar_view"""
+    cache = get_figure_cache()
+    key = (first_year, first_month, num_months, is_admin, get_data_version(df))
+    fig = lru_get(cache, key)
+    if fig is None:
+        fig = create_multi_month_view(df, first_month, first_year, num_months, is_admin)
+        lru_put(cache, key, fig, FIGURE_CACHE_SIZE)
+    return fig
+
+def create_multi_month_view(df, first_month, first_year, num_months, is_admin=False):
+    """
+    Create a season or full-year calendar: one small heatmap per month, all
+    filled from a single lookup of the occupancy index over the whole range
+    """
+    range_start, range_end = month_range(first_month, first_year, num_months)
+    num_days = (range_end - range_start).days + 1
+    
+    # One day x status lookup for the whole range
+    required_columns = ['Check-In', 'Check-Out', 'Status']
+    if all(col in df.columns for col in required_columns):
+        _, status, position = occupancy_window(
+            build_occupancy_index(df, get_data_version(df)), range_start, num_days
+        )
+    else:
+        status = np.zeros(num_days, dtype=np.int8)
+        position = np.zeros(num_days, dtype=np.int8)
     
-    # Create three columns
-    col1, col2, col3 = st.columns(3)
+    # Public view: only show approved reservations
+    if not is_admin:
+        hidden = status != STATUS_APPROVED
+        status = np.where(hidden, STATUS_NONE, status)
+        position = np.where(hidden, POSITION_NONE, position)
     
-    # [Rest of the admin_panel function remains the same...]
-    # Pending Reservations Column
-    with col1:
-        st.markdown('<div class="pending-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">⏳ Pending Reservations</div>', unsafe_allow_html=True)
-        
-        if not pending_reservations.empty:
-            for idx, reservation in pending_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Pending')
-                
-                if action == "approve":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Approved')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(message)
-                
-                elif action == "deny":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Denied')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No pending reservations")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    return multi_month_figure(first_month, first_year, num_months, status, position)
+
+def multi_month_figure(first_month, first_year, num_months, status, position):
+    """
+    Build the Plotly season/year calendar from per-day status and position
+    codes covering every day of the months shown
+    """
+    import plotly.graph_objects as go
+    from plotly.subplots import make_subplots
+    
+    range_start, _ = month_range(first_month, first_year, num_months)
+    months = [((first_month - 1 + k) % 12 + 1, first_year + (first_month - 1 + k) // 12)
+              for k in range(num_months)]
+    num_cols = min(num_months, 3)
+    num_rows = -(-num_months // num_cols)
+    fig = make_subplots(
+        rows=num_rows, cols=num_cols,
+        subplot_titles=[f"{calendar.month_name[month]} {year}" for month, year in months],
+        horizontal_spacing=0.04, vertical_spacing=0.3 / num_rows
+    )
     
-    # Approved Reservations Column
-    with col2:
-        st.markdown('<div class="approved-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">✅ Approved Reservations</div>', unsafe_allow_html=True)
-        
-        if not approved_reservations.empty:
-            for idx, reservation in approved_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Approved')
-                
-                if action == "pending":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Pending')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No approved reservations")
+    shapes = []
+    for k, (month, year) in enumerate(months):
+        # Month grid padded to six weeks so every panel has the same shape
+        grid = np.zeros((6, 7), dtype=int)
+        weeks = calendar.monthcalendar(year, month)
+        grid[:len(weeks)] = weeks
+        in_month = grid > 0
         
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Denied Reservations Column
-    with col3:
-        st.markdown('<div class="denied-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">❌ Denied Reservations</div>', unsafe_allow_html=True)
+        offset = (date(year, month, 1) - range_start).days
+        day_idx = np.where(in_month, offset + grid - 1, 0)
+        status_grid = np.where(in_month, status[day_idx], STATUS_NONE)
+        position_grid = np.where(in_month, position[day_idx], POSITION_NONE)
         
-        if not denied_reservations.empty:
-            for idx, reservation in denied_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Denied')
-                
-                if action == "approve":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Approved')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(message)
-                
-                elif action == "pending":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Pending')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No denied reservations")
+        fig.add_trace(go.Heatmap(
+            z=STATUS_HEAT[status_grid],
+            x=WEEKDAY_LABELS,
+            y=list(range(6)),
+            text=np.where(in_month, grid.astype(str), ''),
+            texttemplate="%{text}",
+            textfont=dict(size=9),
+            zmin=0, zmax=1,
+            colorscale=CALENDAR_COLORSCALE,
+            showscale=False,
+            xgap=1, ygap=1,
+            hoverinfo='skip'
+        ), row=k // num_cols + 1, col=k % num_cols + 1)
         
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    st.divider()
-    
-    # All reservations table
-    st.subheader("📋 All Reservations Table")
-    
-    # Filter options
-    col1, col2 = st.columns(2)
-    with col1:
-        status_filter = st.selectbox("Filter by Status", ['All', 'Pending', 'Approved', 'Denied'])
-    with col2:
-        month_filter = st.selectbox("Filter by Month", 
-                                   ['All'] + [calendar.month_name[i] for i in range(1, 13)])
-    
-    # Apply filters
-    filtered_df = df.copy()
-    if status_filter != 'All':
-        filtered_df = filtered_df[filtered_df['Status'] == status_filter]
-    
-    if month_filter != 'All':
-        month_num = list(calendar.month_name).index(month_filter)
-        filtered_df = filtered_df[filtered_df['Check-In'].apply(lambda x: x.month) == month_num]
-    
-    # Format the dataframe for display
-    display_df = filtered_df.copy()
-    if 'Number of Guests' in display_df.columns:
-        display_df['Number of Guests'] = display_df['Number of Guests'].astype(int)
-    
-    # Display table with better formatting
-    st.dataframe(
-        display_df, 
-        use_container_width=True,
-        column_config={
-            "Number of Guests": st.column_config.NumberColumn(
-                "Number of Guests",
-                format="%d"
-            )
-        }
+        # Outline reservation boundaries like the single-month calendar
+        axis = "" if k == 0 else str(k + 1)
+        left_edges = (position_grid == POSITION_START) | (position_grid == POSITION_SINGLE)
+        right_edges = (position_grid == POSITION_END) | (position_grid == POSITION_SINGLE)
+        for edges, dx in ((left_edges, -0.5), (right_edges, 0.5)):
+            for i, j in zip(*np.nonzero(edges & (status_grid != STATUS_NONE))):
+                shapes.append(dict(
+                    type="line", xref=f"x{axis}", yref=f"y{axis}",
+                    x0=int(j)+dx, y0=int(i)-0.5, x1=int(j)+dx, y1=int(i)+0.5,
+                    line=dict(color="black", width=2)
+                ))
+    
+    fig.update_xaxes(side='top', tickangle=0, tickfont=dict(size=9), fixedrange=True)
+    fig.update_yaxes(autorange='reversed', showticklabels=False, fixedrange=True)
+    fig.update_layout(
+        shapes=shapes,
+        height=260 * num_rows,
+        margin=dict(t=60),
+        dragmode=False
     )
-
-
-def public_view(df):
-    """Public calendar view for guests with enhanced reservation indicators"""
-    st.header("Schieberl Cabin Reservations")
-    st.markdown('<p class="sub-header">View availability and upcoming reservations</p>', unsafe_allow_html=True)
-    
-    # Calendar controls
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        selected_month = st.selectbox("Month", 
-                                     options=list(range(1, 13)),
-                                     format_func=lambda x: calendar.month_name[x],
-                                     index=datetime.now().month - 1)
-    
-    with col2:
-        selected_year = st.selectbox("Year", 
-                                    options=list(range(2025, 2028)),
-                                    index=0)
-    
-    # Display calendar
-    calendar_fig = create_calendar_view(df, selected_month, selected_year, is_admin=False)
-    st.plotly_chart(calendar_fig, use_container_width=True)
-    
-    # Enhanced legend for public view
-    st.markdown("""
-    **Legend:**
-    - 🟢 Green: Reserved
-    - ⚪ White: Available
-    
-    **Reservation Indicators:**
-    - `||Day` : Reservation starts on this day
-    - `Day||` : Reservation ends on this day  
-    - `||Day||` : Single-day reservation
-    - `Day` : Middle of multi-day reservation
-    """)
-    
-    # Upcoming reservations
-    st.subheader("📅 Upcoming Reservations")
-    
-    # Check if we have the required data for upcoming reservations
-    if df.empty or 'Check-In' not in df.columns:
-        st.info("No reservation data available.")
-        return
-    
-    # Filter for future approved reservations
-    today = datetime.now().date()
-    upcoming = df[(df['Check-In'] >= today) & (df['Status'] == 'Approved')].copy()
-    upcoming = upcoming.sort_values('Check-In')
-    
-    if not upcoming.empty:
-        for _, reservation in upcoming.iterrows():
-            # Format number of guests as integer
-            guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
-            with st.container():
-                st.markdown(f"""
-                <div class="reservation-card">
-                    <strong>{reservation['Guest Name']}</strong><br>
-                    📅 {reservation['Check-In']} to {reservation['Check-Out']}<br>
-                    👥 {guest_count} guests<br>
-                    <span class="status-approved">Approved</span>
-                </div>
-                """, unsafe_allow_html=True)
-    else:
-        st.info("No upcoming approved reservations.")
-    
-    # Reservation form link
-    st.subheader("📝 Make a Reservation")
-    st.markdown("""
-    To request a reservation, please fill out the Google Form below:
-    
-    [**🔗 Cabin Reservation Request Form**](https://forms.google.com/your-form-link)
     
-    """)
+    return fig
 
 def create_empty_calendar(selected_month, selected_year):
     """Create an empty calendar when no data is available"""
+    import plotly.graph_objects as go
+    
     # Create calendar data
     cal = calendar.monthcalendar(selected_year, selected_month)
     
@@ -757,71 +1814,537 @@ def create_empty_calendar(selected_month, selected_year):
                     )
                 )
     
-    fig.update_layout(
-        annotations=annotations,
-        title=f"{calendar.month_name[selected_month]} {selected_year} - No Data Available",
-        height=400,
-        yaxis=dict(autorange='reversed'),
-        xaxis=dict(side='top', tickangle=0)
-    )
+    fig.update_layout(
+        annotations=annotations,
+        title=f"{calendar.month_name[selected_month]} {selected_year} - No Data Available",
+        height=400,
+        yaxis=dict(autorange='reversed'),
+        xaxis=dict(side='top', tickangle=0)
+    )
+    
+    return fig
+
+def render_reservation_card(reservation, idx, status_type, conflict=None):
+    """
+    Render a reservation card as a collapsed one-line summary; the details
+    and actions show when it is expanded. ``conflict`` describes the approved
+    stays the reservation overlaps, if any.
+    """
+    guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
+    summary = (f"**{reservation['Guest Name']}** · {reservation['Check-In']:{DISPLAY_DATE_FORMAT}} → "
+               f"{reservation['Check-Out']:{DISPLAY_DATE_FORMAT}} · 👥 {guest_count}")
+    if conflict:
+        summary = "⚠️ " + summary
+    
+    with st.expander(summary):
+        if conflict:
+            st.warning(f"Overlaps approved stay: {conflict}")
+        st.markdown(reservation_card_markdown(reservation, status_type))
+        
+        # Action buttons based on status
+        if status_type == 'Pending':
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("✅ Approve", key=f"approve_{idx}", use_container_width=True,
+                          on_click=apply_card_action, args=(idx, status_type, "approve"))
+            with col2:
+                st.button("❌ Deny", key=f"deny_{idx}", use_container_width=True,
+                          on_click=apply_card_action, args=(idx, status_type, "deny"))
+        
+        elif status_type == 'Approved':
+            st.button("🔄 Move to Pending", key=f"pending_{idx}", use_container_width=True,
+                      on_click=apply_card_action, args=(idx, status_type, "pending"))
+        
+        elif status_type == 'Denied':
+            col1, col2 = st.columns(2)
+            with col1:
+                st.button("✅ Approve", key=f"approve_denied_{idx}", use_container_width=True,
+                          on_click=apply_card_action, args=(idx, status_type, "approve"))
+            with col2:
+                st.button("🔄 Move to Pending", key=f"pending_denied_{idx}", use_container_width=True,
+                          on_click=apply_card_action, args=(idx, status_type, "pending"))
+
+def apply_card_action(row_index, status_type, action):
+    """
+    Button callback applying a card action. Only the card's column, the
+    column it moves to and the background write status rerun; the outcome
+    shows at the top of the card's column.
+    """
+    new_status = ACTION_STATUS[action]
+    success, message = update_reservation_status(
+        load_google_sheets_data(), row_index, new_status,
+        optimistic=st.session_state.optimistic_updates
+    )
+    st.session_state[f"card_result_{status_type}"] = (success, message)
+    rerun_fragments({f"cards_{status_type}", f"cards_{new_status}", "sync_status"} if success
+                    else {f"cards_{status_type}"})
+
+def reservation_card_markdown(reservation, status_type):
+    """Build the body of a reservation card as a single markdown block"""
+    guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
+    
+    # Guest information
+    lines = [
+        f"📧 {reservation['Email Address']}",
+        f"📱 {reservation['Phone Number']}",
+        f"👥 {guest_count} guests",
+    ]
+    
+    # Date information
+    checkin_day = reservation['Check-In'].strftime('%A')
+    checkout_day = reservation['Check-Out'].strftime('%A')
+    duration = (reservation['Check-Out'] - reservation['Check-In']).days
+    lines += [
+        f"📅 **Check-in:** {reservation['Check-In']:{DISPLAY_DATE_FORMAT}}, {checkin_day}",
+        f"📅 **Check-out:** {reservation['Check-Out']:{DISPLAY_DATE_FORMAT}}, {checkout_day}",
+        f"🏠 **Duration:** {duration} nights",
+    ]
+    
+    # Notes
+    if reservation['Notes'] and str(reservation['Notes']).strip():
+        lines.append(f"📝 **Notes:** {reservation['Notes']}")
+    
+    # Admin notes for denied reservations
+    if status_type == 'Denied' and 'Admin Notes' in reservation and reservation['Admin Notes']:
+        lines.append(f"❌ **Admin Notes:** {reservation['Admin Notes']}")
+    
+    return "  \n".join(lines)
+
+def render_pager(key, num_items, page_size):
+    """
+    Previous/next controls for a paginated list, with the current page kept
+    in session state under ``key``. Returns the slice of items to show.
+    """
+    num_pages = max(1, -(-num_items // page_size))
+    page = min(st.session_state.get(key, 0), num_pages - 1)
+    st.session_state[key] = page
+    
+    if num_pages > 1:
+        col1, col2, col3 = st.columns([1, 2, 1])
+        with col1:
+            st.button("◀", key=f"{key}_prev", disabled=page == 0, use_container_width=True,
+                      on_click=shift_page, args=(key, -1))
+        with col2:
+            st.caption(f"Page {page + 1} of {num_pages} · {num_items} total")
+        with col3:
+            st.button("▶", key=f"{key}_next", disabled=page == num_pages - 1, use_container_width=True,
+                      on_click=shift_page, args=(key, 1))
+    
+    return slice(page * page_size, (page + 1) * page_size)
+
+def shift_page(key, step):
+    """Button callback moving a paginated list by ``step`` pages"""
+    st.session_state[key] = st.session_state.get(key, 0) + step
+
+def fragment(key):
+    """
+    Decorator turning a section into a fragment: its own widgets rerun only
+    the section, and widget callbacks can rerun it by ``key`` through
+    rerun_fragments. Without keyed fragments the section is a plain function.
+    """
+    def decorate(func):
+        return st.fragment(key=key)(func) if KEYED_FRAGMENTS else func
+    return decorate
+
+def rerun_fragments(keys):
+    """
+    From a widget callback, rerun only the fragments ``keys`` instead of the
+    callback's default. Without keyed fragments the whole app reruns.
+    """
+    if KEYED_FRAGMENTS:
+        st.rerun(sorted(keys))
+
+def calendar_controls(years, key_prefix):
+    """
+    Month/season/year pickers shared by the public and admin calendars.
+    Returns the first month, its year and the number of months to show.
+    """
+    today = datetime.now()
+    span = st.radio("Calendar view", list(CALENDAR_SPANS), horizontal=True,
+                    key=f"{key_prefix}_calendar_span")
+    
+    col1, col2 = st.columns(2)
+    
+    with col1:
+        if span == "Full year":
+            selected_month = 1
+        else:
+            selected_month = st.selectbox("Month" if span == "Month" else "Starting month", 
+                                          options=list(range(1, 13)),
+                                          format_func=lambda x: calendar.month_name[x],
+                                          index=today.month - 1,
+                                          key=f"{key_prefix}_month_select")
     
-    return fig
+    with col2:
+        selected_year = st.selectbox("Year", 
+                                     options=years,
+                                     index=years.index(today.year) if today.year in years else 0,
+                                     key=f"{key_prefix}_year_select")
+    
+    num_months = CALENDAR_SPANS[span]
+    if num_months is None:
+        num_months = st.slider("Number of months", 2, 12, 4, key=f"{key_prefix}_season_length")
+    return selected_month, selected_year, num_months
 
-def render_reservation_card(reservation, idx, status_type):
-    """Render a reservation card with appropriate styling and actions"""
-    guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
+def render_status_column(reservations, status_type, page_size, approved=None):
+    """
+    Render one page of the reservation cards of a status column, flagging
+    the cards overlapping a stay in ``approved`` with the stays they overlap
+    (see reservation_conflicts). Bulk selections are kept in session state
+    across pages (see select_for_bulk) and collected by selected_bulk_changes.
+    """
+    column = STATUS_COLUMNS[status_type]
+    st.markdown(f'<div class="{column["css_class"]}">', unsafe_allow_html=True)
+    st.markdown(f'<div class="column-header">{column["title"]}</div>', unsafe_allow_html=True)
+    
+    # Outcome of the last card action taken in this column
+    card_result = st.session_state.pop(f"card_result_{status_type}", None)
+    if card_result:
+        success, message = card_result
+        (st.success if success else st.error)(message)
+    
+    reservations = reservations[reservations['Status'] == status_type].sort_values(
+        'Check-In', ascending=column['oldest_first'], kind='stable'
+    )
     
-    with st.container(border=True):
-        # Guest information
-        st.write(f"**{reservation['Guest Name']}**")
-        st.write(f"📧 {reservation['Email Address']}")
-        st.write(f"📱 {reservation['Phone Number']}")
-        st.write(f"👥 {guest_count} guests")
-        
-        # Date information
-        checkin_day = reservation['Check-In'].strftime('%A')
-        checkout_day = reservation['Check-Out'].strftime('%A')
-        st.write(f"📅 **Check-in:** {reservation['Check-In']}, {checkin_day}")
-        st.write(f"📅 **Check-out:** {reservation['Check-Out']}, {checkout_day}")
-        duration = (reservation['Check-Out'] - reservation['Check-In']).days
-        st.write(f"🏠 **Duration:** {duration} nights")
-        
-        # Notes
-        if reservation['Notes'] and str(reservation['Notes']).strip():
-            st.write(f"📝 **Notes:** {reservation['Notes']}")
-        
-        # Admin notes for denied reservations
-        if status_type == 'Denied' and 'Admin Notes' in reservation and reservation['Admin Notes']:
-            st.write(f"❌ **Admin Notes:** {reservation['Admin Notes']}")
-        
-        # Action buttons based on status
-        if status_type == 'Pending':
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("✅ Approve", key=f"approve_{idx}", use_container_width=True):
-                    return "approve"
-            with col2:
-                if st.button("❌ Deny", key=f"deny_{idx}", use_container_width=True):
-                    return "deny"
+    if not reservations.empty:
+        # Bulk selections of every page, minus rows that left this column since
+        generation = st.session_state.bulk_generation
+        selection_key = f"bulk_selected_{status_type}_{generation}"
+        chosen = {idx for idx in st.session_state.get(selection_key, ()) if idx in reservations.index}
+        st.session_state[selection_key] = chosen
         
-        elif status_type == 'Approved':
-            if st.button("🔄 Move to Pending", key=f"pending_{idx}", use_container_width=True):
-                return "pending"
+        # Only the current page is rendered
+        page_key = f"page_{status_type}"
+        reservations = reservations.iloc[render_pager(page_key, len(reservations), page_size)]
         
-        elif status_type == 'Denied':
-            col1, col2 = st.columns(2)
-            with col1:
-                if st.button("✅ Approve", key=f"approve_denied_{idx}", use_container_width=True):
-                    return "approve"
-            with col2:
-                if st.button("🔄 Move to Pending", key=f"pending_denied_{idx}", use_container_width=True):
-                    return "pending"
+        # Bulk selection of this page, also rerunning the bulk apply button
+        rerun_keys = ({f"cards_{status_type}", "bulk_actions"},)
+        page_rows = list(reservations.index)
+        widget_key = f"bulk_select_{status_type}_{generation}_{st.session_state[page_key]}"
+        labels = reservations['Guest Name'] + " (" + reservations['Check-In'].dt.strftime(DISPLAY_DATE_FORMAT) + ")"
+        st.multiselect("Select for bulk action",
+                       options=page_rows,
+                       default=[idx for idx in page_rows if idx in chosen],
+                       format_func=lambda idx: labels[idx],
+                       key=widget_key,
+                       on_change=select_for_bulk, args=(status_type, page_rows, widget_key))
+        elsewhere = len(chosen.difference(page_rows))
+        if elsewhere:
+            st.caption(f"{len(chosen)} selected in total, {elsewhere} on other pages")
+        if chosen:
+            st.selectbox("Bulk action", list(column['bulk_actions']),
+                         key=f"bulk_action_{status_type}_{generation}",
+                         on_change=rerun_fragments, args=rerun_keys)
         
-    return None
+        # Only the flagged cards of this page look up what they overlap
+        flagged = set()
+        if approved is not None and status_type != 'Approved':
+            overlap_index = build_overlap_index(approved, get_data_version(approved))
+            flagged = set(reservation_conflicts(reservations, overlap_index))
+        for idx, reservation in reservations.iterrows():
+            conflict = (describe_stays(approved, conflicting_stays(reservations, overlap_index, idx))
+                        if idx in flagged else None)
+            render_reservation_card(reservation, idx, status_type, conflict)
+    else:
+        st.info(column['empty_message'])
+    
+    st.markdown('</div>', unsafe_allow_html=True)
+
+def select_for_bulk(status_type, page_rows, widget_key):
+    """
+    Multiselect callback merging one page's bulk selection into the
+    column's selection across pages, then rerunning the column and the bulk
+    apply button
+    """
+    selection_key = f"bulk_selected_{status_type}_{st.session_state.bulk_generation}"
+    chosen = set(st.session_state.get(selection_key, ())).difference(page_rows)
+    st.session_state[selection_key] = chosen.union(st.session_state[widget_key])
+    rerun_fragments({f"cards_{status_type}", "bulk_actions"})
+
+def selected_bulk_changes():
+    """
+    The bulk status changes selected in the status columns, on any of their
+    pages, as a dict mapping row keys to the new status
+    """
+    generation = st.session_state.bulk_generation
+    bulk_changes = {}
+    for status_type, column in STATUS_COLUMNS.items():
+        selected = st.session_state.get(f"bulk_selected_{status_type}_{generation}")
+        if selected:
+            bulk_action = st.session_state.get(f"bulk_action_{status_type}_{generation}",
+                                               next(iter(column['bulk_actions'])))
+            bulk_changes.update({idx: column['bulk_actions'][bulk_action] for idx in sorted(selected)})
+    return bulk_changes
+
+def status_column_section(store, status_type, page_size):
+    """
+    A status column with its own data, rerun on its own by its cards (see
+    STATUS_COLUMN_SECTIONS). Only the column's reservations and the approved
+    stays they are checked against are queried from the store.
+    """
+    render_status_column(query_store(store, 'reservations_with_status', status_type), status_type,
+                         page_size, query_store(store, 'reservations_with_status', 'Approved'))
+
+# One fragment per status column, rerun by key when a card moves between columns
+STATUS_COLUMN_SECTIONS = {
+    status_type: fragment(f"cards_{status_type}")(status_column_section) for status_type in STATUS_COLUMNS
+}
+
+@fragment("bulk_actions")
+def bulk_apply_section(store):
+    """Apply the bulk selections of all columns in one batched write followed by one full rerun"""
+    bulk_changes = selected_bulk_changes()
+    if st.button(f"Apply {len(bulk_changes)} bulk change(s)", disabled=not bulk_changes,
+                 type="primary", key="bulk_apply"):
+        with st.spinner("Updating statuses..."):
+            st.session_state.bulk_report = update_reservation_statuses(
+                load_google_sheets_data(store), bulk_changes, optimistic=st.session_state.optimistic_updates
+            )
+        # Start the next run with fresh (empty) bulk selections
+        for status_type in STATUS_COLUMNS:
+            st.session_state.pop(f"bulk_selected_{status_type}_{st.session_state.bulk_generation}", None)
+        st.session_state.bulk_generation += 1
+        st.rerun()
+
+@fragment("sync_status")
+def sync_status_section():
+    """
+    Background status writes, rerun with the columns by card actions. While
+    writes are saving it polls them and reruns the app once they are done,
+    so a failed save shows and its rolled back card returns to its column.
+    """
+    render_sync_status()
+    if status_sync_pending():
+        poll_status_sync()
+
+def wait_for_status_sync():
+    """Rerun the app once no background status write is saving any more"""
+    if not status_sync_pending():
+        st.rerun()
+
+# Polled on its own, nested in sync_status_section, only while writes are saving
+poll_status_sync = (st.fragment(run_every=SYNC_POLL_INTERVAL)(wait_for_status_sync)
+                    if hasattr(st, 'fragment') else wait_for_status_sync)
+
+@st.cache_data(show_spinner=False, max_entries=NORMALIZED_CACHE_SIZE)
+def build_reservation_analytics(_df, data_version):
+    """
+    Aggregate the reservations for the analytics section in one vectorized
+    pass. Returns a dict with:
+    
+    - ``status_counts``: reservations per status
+    - ``monthly``: one row per month (by check-in) with the requests per
+      status, approved nights booked (every night of every approved stay,
+      counted once), and the guest and lead time totals of the approved stays
+    
+    Cached per ``data_version`` (see get_data_version).
+    """
+    df = _df
+    analytics = {'status_counts': pd.Series(0, index=RESERVATION_STATUSES), 'monthly': pd.DataFrame()}
+    if df.empty or not {'Check-In', 'Check-Out', 'Status'}.issubset(df.columns):
+        return analytics
+    analytics['status_counts'] = df['Status'].value_counts().reindex(RESERVATION_STATUSES, fill_value=0)
+    
+    month = df['Check-In'].dt.to_period('M').rename('Month')
+    approved = df[df['Status'] == 'Approved']
+    approved_month = month[approved.index]
+    
+    # Requests per status and check-in month
+    monthly = df.groupby([month, 'Status'], observed=False).size().unstack('Status', fill_value=0)
+    monthly['Requests'] = monthly.sum(axis=1)
+    
+    # Guests and lead time (request to check-in, in days) of approved stays
+    monthly['Guests'] = approved['Number of Guests'].groupby(approved_month).sum()
+    if 'Timestamp' in df.columns:
+        lead_days = (approved['Check-In'] - approved['Timestamp'].dt.normalize()).dt.days
+        lead_days = lead_days[lead_days >= 0]
+        monthly['Lead days'] = lead_days.groupby(approved_month[lead_days.index]).sum()
+        monthly['Lead count'] = lead_days.groupby(approved_month[lead_days.index]).size()
+    
+    # Approved nights: expand every stay into its nights, each night counted once
+    start, end = stay_nights(approved)
+    valid = start >= 0
+    lengths = (end - start)[valid]
+    nights = np.repeat(start[valid], lengths) + (np.arange(lengths.sum()) - np.repeat(np.cumsum(lengths) - lengths, lengths))
+    night_months, night_counts = np.unique(np.unique(nights).astype('datetime64[D]').astype('datetime64[M]'),
+                                           return_counts=True)
+    booked = pd.Series(night_counts, index=pd.PeriodIndex(night_months, freq='M'))
+    
+    # One row per month from the first to the last month with any data
+    months = monthly.index.union(booked.index)
+    if len(months) == 0:
+        return analytics
+    monthly = monthly.reindex(pd.period_range(months.min(), months.max(), freq='M'))
+    monthly['Nights booked'] = booked
+    monthly = monthly.fillna(0)
+    monthly['Days'] = monthly.index.days_in_month
+    monthly.index = monthly.index.to_timestamp()
+    analytics['monthly'] = monthly
+    return analytics
+
+def render_analytics(analytics):
+    """Occupancy, party size, lead time and approval charts for one year of the analytics"""
+    monthly = analytics['monthly']
+    if monthly.empty:
+        st.info("Not enough reservation data for analytics yet.")
+        return
+    
+    years = sorted(monthly.index.year.unique())
+    this_year = datetime.now().year
+    year = st.selectbox("Year", years, index=years.index(this_year) if this_year in years else len(years) - 1,
+                        key="analytics_year")
+    months = monthly[monthly.index.year == year]
+    
+    # Year totals
+    col1, col2, col3, col4 = st.columns(4)
+    with col1:
+        st.metric("Occupancy", f"{months['Nights booked'].sum() / months['Days'].sum():.0%}")
+    with col2:
+        st.metric("Nights Booked", int(months['Nights booked'].sum()))
+    with col3:
+        approved = months['Approved'].sum()
+        st.metric("Avg Party Size", f"{months['Guests'].sum() / approved:.1f}" if approved else "–")
+    with col4:
+        lead_count = months['Lead count'].sum() if 'Lead count' in months else 0
+        st.metric("Avg Lead Time", f"{months['Lead days'].sum() / lead_count:.0f} days" if lead_count else "–")
+    
+    # Per-month charts
+    requests = months['Requests'].where(months['Requests'] > 0)
+    charts = pd.DataFrame({
+        'Nights booked': months['Nights booked'].to_numpy(),
+        'Occupancy': (months['Nights booked'] / months['Days']).to_numpy(),
+        'Approval rate': (months['Approved'] / requests).to_numpy(),
+        'Denial rate': (months['Denied'] / requests).to_numpy(),
+        'Avg party size': (months['Guests'] / months['Approved'].where(months['Approved'] > 0)).to_numpy(),
+    }, index=months.index.rename('Month'))
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        st.caption("Nights booked per month")
+        st.bar_chart(charts['Nights booked'])
+        st.caption("Average party size (approved stays)")
+        st.bar_chart(charts['Avg party size'])
+    with col2:
+        st.caption("Occupancy rate")
+        st.line_chart(charts['Occupancy'])
+        st.caption("Approval and denial rates (by check-in month)")
+        st.line_chart(charts[['Approval rate', 'Denial rate']])
+
+@st.cache_resource(max_entries=NORMALIZED_CACHE_SIZE, show_spinner=False)
+def build_filter_index(_df, data_version):
+    """
+    Indexes behind the All Reservations table filters, built once per data
+    version (see filter_positions). Holds, by row position:
+    
+    - ``check_in``/``check_out``: day numbers, and ``by_check_in``: positions
+      sorted by check-in, for date range queries
+    - ``statuses``: the sorted positions of each status
+    - ``tokens``: a sorted vocabulary of the lowercase words in guest names,
+      emails and notes, with ``postings`` holding the positions of each word
+      between its ``offsets``
+    
+    Shared by all sessions as a cached resource; must not be modified.
+    """
+    df = _df
+    check_in = df['Check-In'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    check_out = df['Check-Out'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+    by_check_in = np.argsort(check_in, kind='stable')
+    index = {
+        'size': len(df),
+        'check_in': check_in,
+        'check_out': check_out,
+        'by_check_in': by_check_in,
+        'sorted_check_in': check_in[by_check_in],
+        'max_length': int((check_out - check_in).max()) if len(df) else 0,
+        'statuses': {status: np.flatnonzero(df['Status'].eq(status).to_numpy())
+                     for status in RESERVATION_STATUSES},
+    }
+    
+    # Word -> positions, as one sorted (word, position) table
+    text = pd.Series('', index=np.arange(len(df)), dtype=TEXT_DTYPE)
+    for column in ('Guest Name', 'Email Address', 'Notes'):
+        if column in df.columns:
+            text = text + ' ' + df[column].astype(TEXT_DTYPE).to_numpy()
+    words = text.str.lower().str.findall(r'[a-z0-9]+').explode().dropna()
+    pairs = pd.DataFrame({'token': words.to_numpy(dtype=str), 'position': words.index.to_numpy()})
+    pairs = pairs.drop_duplicates().sort_values(['token', 'position'])
+    tokens, first = np.unique(pairs['token'].to_numpy(dtype=str), return_index=True)
+    index['tokens'] = tokens
+    index['offsets'] = np.append(first, len(pairs))
+    index['postings'] = pairs['position'].to_numpy()
+    return index
+
+def filter_positions(index, start=None, end=None, statuses=None, text=''):
+    """
+    Row positions of the reservations matching every given filter, in sheet
+    order, or None when no filter is set:
+    
+    - ``start``/``end``: stays overlapping those dates (inclusive), found by
+      binary search on the check-in order
+    - ``statuses``: any of these statuses
+    - ``text``: every word is a word of the guest name, email or notes
+      (case-insensitive), the last one possibly only its start as it is
+      still being typed, found by binary search on the vocabulary
+    
+    The smallest matches are intersected first; the last word's prefix
+    matches are only checked against what is left.
+    """
+    matches = []
+    if start is not None or end is not None:
+        first_day = np.datetime64(start, 'D').astype(np.int64) if start is not None else None
+        last_day = np.datetime64(end, 'D').astype(np.int64) if end is not None else None
+        sorted_check_in = index['sorted_check_in']
+        # Only stays checking in no later than the end and less than the longest stay before the start
+        lo = np.searchsorted(sorted_check_in, first_day - index['max_length'], side='left') if start is not None else 0
+        hi = np.searchsorted(sorted_check_in, last_day, side='right') if end is not None else len(sorted_check_in)
+        candidates = index['by_check_in'][lo:hi]
+        if start is not None:
+            candidates = candidates[index['check_out'][candidates] >= first_day]
+        matches.append(np.sort(candidates))
+    
+    if statuses:
+        groups = [index['statuses'][status] for status in statuses]
+        matches.append(groups[0] if len(groups) == 1 else np.sort(np.concatenate(groups)))
+    
+    words = re.findall(r'[a-z0-9]+', (text or '').lower())
+    prefix = None
+    for i, word in enumerate(words):
+        # Earlier words match one vocabulary entry; the entries starting with the last form a sorted run
+        lo = np.searchsorted(index['tokens'], word, side='left')
+        if i < len(words) - 1:
+            hi = lo + 1 if lo < len(index['tokens']) and index['tokens'][lo] == word else lo
+        else:
+            hi = np.searchsorted(index['tokens'], word + '\uffff', side='left')
+        postings = index['postings'][index['offsets'][lo]:index['offsets'][hi]]
+        if hi - lo > 1:
+            # Several words start with the last one: merged without sorting below
+            prefix = postings
+        else:
+            matches.append(postings)
+    
+    if not matches and prefix is None:
+        return None
+    
+    # Intersect from the smallest match up, probing the larger ones by binary search
+    matches.sort(key=len)
+    positions = matches[0] if matches else np.arange(index['size'])
+    for other in matches[1:]:
+        if len(positions) == 0:
+            break
+        found = np.searchsorted(other, positions).clip(max=len(other) - 1)
+        positions = positions[other[found] == positions] if len(other) else positions[:0]
+    
+    if prefix is not None and len(positions):
+        found = np.zeros(index['size'], dtype=bool)
+        found[prefix] = True
+        positions = positions[found[positions]]
+    return positions
 
-def admin_panel(df):
+def admin_panel(store):
     """Enhanced admin panel with three-column layout for reservation management"""
     st.header("Admin Panel")
+    df = load_google_sheets_data(store)
     
     # Check if DataFrame is empty
     if df.empty:
@@ -837,7 +2360,10 @@ def admin_panel(df):
         st.write("Available columns:", list(df.columns))
         return
     
-    # Summary metrics
+    # Summary metrics, from the analytics cached per data version
+    with profile_phase("Analytics"):
+        analytics = build_reservation_analytics(df, get_data_version(df))
+    status_counts = analytics['status_counts']
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
@@ -845,214 +2371,196 @@ def admin_panel(df):
         st.metric("Total Reservations", total_reservations)
     
     with col2:
-        pending_count = len(df[df['Status'] == 'Pending'])
+        pending_count = int(status_counts['Pending'])
         st.metric("Pending Approval", pending_count)
     
     with col3:
-        approved_count = len(df[df['Status'] == 'Approved'])
+        approved_count = int(status_counts['Approved'])
         st.metric("Approved", approved_count)
     
     with col4:
-        denied_count = len(df[df['Status'] == 'Denied'])
+        denied_count = int(status_counts['Denied'])
         st.metric("Denied", denied_count)
     
+    # Occupancy analytics
+    with st.expander("📊 Occupancy Analytics"):
+        render_analytics(analytics)
+    
     st.divider()
     
     # Admin Calendar Section
-    st.subheader("📅 Admin Calendar")
-    
-    # Calendar controls
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        admin_selected_month = st.selectbox("Month", 
-                                           options=list(range(1, 13)),
-                                           format_func=lambda x: calendar.month_name[x],
-                                           index=datetime.now().month - 1,
-                                           key="admin_month_select")
-    
-    with col2:
-        admin_selected_year = st.selectbox("Year", 
-                                         options=list(range(2025, 2028)),
-                                         index=0,
-                                         key="admin_year_select")
-    
-    # Display admin calendar
-    admin_calendar_fig = create_calendar_view(df, admin_selected_month, admin_selected_year, is_admin=True)
-    st.plotly_chart(admin_calendar_fig, use_container_width=True)
-    
-    # Legend for admin calendar
-    st.markdown("""
-    **Legend:**
-    - 🟢 Green: Approved reservation
-    - 🟡 Yellow: Pending approval
-    - 🔴 Red: Denied reservation
-    - ⚪ White: Available
-    """)
+    admin_calendar_section(store)
     
     st.divider()
     
     # Three-column reservation management
     st.subheader("📋 Reservation Management")
     
-    # Filter reservations by status using fresh data
-    pending_reservations = df[df['Status'] == 'Pending'].copy()
-    approved_reservations = df[df['Status'] == 'Approved'].copy()
-    denied_reservations = df[df['Status'] == 'Denied'].copy()
+    # Background sheet writes still in flight or failed
+    sync_status_section()
+    
+    # Results of the last bulk action, shown once after the reload
+    bulk_report = st.session_state.pop('bulk_report', None)
+    if bulk_report:
+        updated_count = sum(entry['Updated'] for entry in bulk_report)
+        if updated_count == len(bulk_report):
+            st.success(f"Updated {updated_count} reservations.")
+        else:
+            st.warning(f"Updated {updated_count} of {len(bulk_report)} reservations.")
+        st.dataframe(pd.DataFrame(bulk_report), use_container_width=True, hide_index=True)
+    
+    page_size = st.selectbox("Cards per page", CARD_PAGE_SIZES, index=1, key="admin_page_size")
+    
+    # Requests overlapping an approved stay
+    with profile_phase("Overlap check"):
+        conflicts = build_reservation_conflicts(df, get_data_version(df))
+    pending_conflicts = int((df.loc[conflicts, 'Status'] == 'Pending').sum())
+    if pending_conflicts:
+        st.warning(f"⚠️ {pending_conflicts} pending request(s) overlap an approved stay.")
     
     # Create three columns
     col1, col2, col3 = st.columns(3)
     
-    # Pending Reservations Column
-    with col1:
-        st.markdown('<div class="pending-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">⏳ Pending Reservations</div>', unsafe_allow_html=True)
-        
-        if not pending_reservations.empty:
-            for idx, reservation in pending_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Pending')
-                
-                if action == "approve":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Approved')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)  # Brief pause to ensure update completes
-                            st.rerun()
-                        else:
-                            st.error(message)
-                
-                elif action == "deny":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Denied')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)  # Brief pause to ensure update completes
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No pending reservations")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
-    
-    # Approved Reservations Column
-    with col2:
-        st.markdown('<div class="approved-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">✅ Approved Reservations</div>', unsafe_allow_html=True)
-        
-        if not approved_reservations.empty:
-            for idx, reservation in approved_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Approved')
-                
-                if action == "pending":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Pending')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)  # Brief pause to ensure update completes
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No approved reservations")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Pending, Approved and Denied columns, each rerunnable on its own
+    with profile_phase("Reservation cards"):
+        for column, status_type in zip((col1, col2, col3), STATUS_COLUMNS):
+            with column:
+                STATUS_COLUMN_SECTIONS[status_type](store, status_type, page_size)
     
-    # Denied Reservations Column
-    with col3:
-        st.markdown('<div class="denied-column">', unsafe_allow_html=True)
-        st.markdown('<div class="column-header">❌ Denied Reservations</div>', unsafe_allow_html=True)
-        
-        if not denied_reservations.empty:
-            for idx, reservation in denied_reservations.iterrows():
-                action = render_reservation_card(reservation, idx, 'Denied')
-                
-                if action == "approve":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Approved')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)  # Brief pause to ensure update completes
-                            st.rerun()
-                        else:
-                            st.error(message)
-                
-                elif action == "pending":
-                    with st.spinner("Updating status..."):
-                        success, message = update_reservation_status(df, idx, 'Pending')
-                        if success:
-                            st.success(message)
-                            time.sleep(0.5)  # Brief pause to ensure update completes
-                            st.rerun()
-                        else:
-                            st.error(message)
-        else:
-            st.info("No denied reservations")
-        
-        st.markdown('</div>', unsafe_allow_html=True)
+    # Commit all bulk selections in one batched write
+    bulk_apply_section(store)
     
     st.divider()
     
     # All reservations table (existing functionality)
+    reservations_table_section(store)
+
+@fragment("admin_calendar")
+def admin_calendar_section(store):
+    """
+    Admin calendar with its controls; changing them reruns only this
+    section, which queries the store for the shown months only
+    """
+    st.subheader("📅 Admin Calendar")
+    
+    # Calendar controls
+    admin_selected_month, admin_selected_year, num_months = calendar_controls(
+        query_store(store, 'reservation_years'), key_prefix="admin"
+    )
+    df = query_store(store, 'reservations_overlapping',
+                     *month_range(admin_selected_month, admin_selected_year, num_months))
+    
+    # Display admin calendar
+    with profile_phase("Calendar"):
+        if num_months == 1:
+            admin_calendar_fig = cached_calendar_view(df, admin_selected_month, admin_selected_year, is_admin=True)
+        else:
+            admin_calendar_fig = cached_multi_month_view(df, admin_selected_month, admin_selected_year,
+                                                         num_months, is_admin=True)
+        st.plotly_chart(admin_calendar_fig, use_container_width=True)
+    
+    # Legend for admin calendar
+    st.markdown("""
+    **Legend:**
+    - 🟢 Green: Approved reservation
+    - 🟡 Yellow: Pending approval
+    - 🔴 Red: Denied reservation
+    - ⚪ White: Available
+    """)
+
+@fragment("reservations_table")
+def reservations_table_section(store):
+    """All Reservations table with its filters; filtering reruns only this section"""
+    df = load_google_sheets_data(store)
     st.subheader("📋 All Reservations Table")
     
     # Filter options
-    col1, col2 = st.columns(2)
+    col1, col2, col3 = st.columns([2, 2, 3])
     with col1:
-        status_filter = st.selectbox("Filter by Status", ['All', 'Pending', 'Approved', 'Denied'])
+        status_filter = st.multiselect("Filter by Status", RESERVATION_STATUSES, key="table_status_filter",
+                                       placeholder="All statuses")
     with col2:
-        month_filter = st.selectbox("Filter by Month", 
-                                   ['All'] + [calendar.month_name[i] for i in range(1, 13)])
-    
-    # Apply filters
-    filtered_df = df.copy()
-    if status_filter != 'All':
-        filtered_df = filtered_df[filtered_df['Status'] == status_filter]
+        date_filter = st.date_input("Stays between", value=(), key="table_date_filter")
+    with col3:
+        text_filter = st.text_input("Search", key="table_text_filter",
+                                    placeholder="Guest name, email or notes")
     
-    if month_filter != 'All':
-        month_num = list(calendar.month_name).index(month_filter)
-        filtered_df = filtered_df[filtered_df['Check-In'].apply(lambda x: x.month) == month_num]
+    # Apply filters through the precomputed filter index
+    filter_index = build_filter_index(df, get_data_version(df))
+    start, end = (list(date_filter) * 2)[:2] if date_filter else (None, None)
+    started = time.perf_counter()
+    positions = filter_positions(filter_index, start, end, status_filter, text_filter)
+    filter_ms = (time.perf_counter() - started) * 1000
     
     # Format the dataframe for display
-    display_df = filtered_df.copy()
-    if 'Number of Guests' in display_df.columns:
-        display_df['Number of Guests'] = display_df['Number of Guests'].astype(int)
+    display_df = df if positions is None else df.iloc[positions]
+    st.caption(f"{len(display_df)} of {len(df)} reservations · filtered in {filter_ms:.2f} ms")
     
     # Display table with better formatting
-    st.dataframe(
-        display_df, 
-        use_container_width=True,
-        column_config={
-            "Number of Guests": st.column_config.NumberColumn(
-                "Number of Guests",
-                format="%d"
-            )
-        }
+    with profile_phase("Reservations table"):
+        st.dataframe(
+            display_df, 
+            use_container_width=True,
+            column_config={
+                "Number of Guests": st.column_config.NumberColumn(
+                    "Number of Guests",
+                    format="%d"
+                ),
+                "Check-In": st.column_config.DateColumn("Check-In", format="YYYY-MM-DD"),
+                "Check-Out": st.column_config.DateColumn("Check-Out", format="YYYY-MM-DD"),
+            }
+        )
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def render_upcoming_html(_snapshot, data_version, today, horizon_days, limit):
+    """
+    Render the upcoming approved stays of a public availability snapshot as
+    one HTML fragment, using vectorized string templating over the frame.
+    
+    Cached per data version, day, horizon and limit. Returns the HTML and the
+    number of upcoming stays within the horizon.
+    """
+    # The snapshot is sorted by Check-In
+    stays = _snapshot['upcoming']
+    first_day = pd.Timestamp(today)
+    upcoming = stays[stays['Check-In'] >= first_day]
+    if horizon_days is not None:
+        upcoming = upcoming[upcoming['Check-In'] <= first_day + timedelta(days=horizon_days)]
+    shown = upcoming.iloc[:limit]
+    
+    cards = (
+        '<div class="reservation-card"><strong>' + escape_html(shown['Guest Name']) + '</strong><br>'
+        '📅 ' + shown['Check-In'].dt.strftime(DISPLAY_DATE_FORMAT) + ' to '
+        + shown['Check-Out'].dt.strftime(DISPLAY_DATE_FORMAT) + '<br>'
+        '👥 ' + shown['Number of Guests'].astype(str) + ' guests<br>'
+        '<span class="status-approved">Approved</span></div>'
     )
+    return "\n".join(cards), len(upcoming)
 
-def public_view(df):
-    """Public calendar view for guests with enhanced reservation indicators"""
-    st.header("Schieberl Cabin Reservations")
-    st.markdown('<p class="sub-header">View availability and upcoming reservations</p>', unsafe_allow_html=True)
+def escape_html(values):
+    """Vectorized HTML escaping of a Series of strings"""
+    values = values.astype(str)
+    for char, entity in (('&', '&amp;'), ('<', '&lt;'), ('>', '&gt;'), ('"', '&quot;'), ("'", '&#x27;')):
+        values = values.str.replace(char, entity, regex=False)
+    return values
+
+def show_more_upcoming():
+    """Button callback widening the upcoming reservations window"""
+    st.session_state.upcoming_limit += UPCOMING_PAGE_SIZE
+
+@fragment("public_calendar")
+def public_calendar_section(store):
+    """Public calendar with its controls; changing them reruns only this section"""
+    snapshot = get_public_availability(store)
     
     # Calendar controls
-    col1, col2 = st.columns(2)
-    
-    with col1:
-        selected_month = st.selectbox("Month", 
-                                     options=list(range(1, 13)),
-                                     format_func=lambda x: calendar.month_name[x],
-                                     index=datetime.now().month - 1)
-    
-    with col2:
-        selected_year = st.selectbox("Year", 
-                                    options=list(range(2025, 2028)),
-                                    index=0)
+    years = sorted(set(snapshot['years']) | {datetime.now().year})
+    selected_month, selected_year, num_months = calendar_controls(years, key_prefix="public")
     
     # Display calendar
-    calendar_fig = create_calendar_view(df, selected_month, selected_year, is_admin=False)
-    st.plotly_chart(calendar_fig, use_container_width=True)
+    with profile_phase("Calendar"):
+        calendar_fig = cached_public_calendar(snapshot, selected_month, selected_year, num_months)
+        st.plotly_chart(calendar_fig, use_container_width=True)
     
     # Enhanced legend for public view
     st.markdown("""
@@ -1066,33 +2574,44 @@ def public_view(df):
     - `||Day||` : Single-day reservation
     - `Day` : Middle of multi-day reservation
     """)
+
+def public_view(store):
+    """Public calendar view for guests with enhanced reservation indicators"""
+    st.header("Schieberl Cabin Reservations")
+    st.markdown('<p class="sub-header">View availability and upcoming reservations</p>', unsafe_allow_html=True)
+    
+    # Everything below is rendered from the shared availability snapshot
+    with profile_phase("Availability snapshot"):
+        snapshot = get_public_availability(store)
+    
+    public_calendar_section(store)
     
     # Upcoming reservations
     st.subheader("📅 Upcoming Reservations")
     
     # Check if we have the required data for upcoming reservations
-    if df.empty or 'Check-In' not in df.columns:
+    df = snapshot['upcoming']
+    if 'Check-In' not in df.columns:
         st.info("No reservation data available.")
         return
     
-    # Filter for future approved reservations
-    today = datetime.now().date()
-    upcoming = df[(df['Check-In'] >= today) & (df['Status'] == 'Approved')].copy()
-    upcoming = upcoming.sort_values('Check-In')
-    
-    if not upcoming.empty:
-        for _, reservation in upcoming.iterrows():
-            # Format number of guests as integer
-            guest_count = int(reservation['Number of Guests']) if pd.notna(reservation['Number of Guests']) else 0
-            with st.container():
-                st.markdown(f"""
-                <div class="reservation-card">
-                    <strong>{reservation['Guest Name']}</strong><br>
-                    📅 {reservation['Check-In']} to {reservation['Check-Out']}<br>
-                    👥 {guest_count} guests<br>
-                    <span class="status-approved">Approved</span>
-                </div>
-                """, unsafe_allow_html=True)
+    horizon = st.selectbox("Show", list(UPCOMING_HORIZONS), index=len(UPCOMING_HORIZONS) - 1,
+                           key="upcoming_horizon")
+    if 'upcoming_limit' not in st.session_state:
+        st.session_state.upcoming_limit = UPCOMING_PAGE_SIZE
+    
+    # Future approved reservations as one cached HTML fragment
+    with profile_phase("Upcoming list"):
+        cards_html, total = render_upcoming_html(
+            snapshot, snapshot['data_version'], datetime.now().date(),
+            UPCOMING_HORIZONS[horizon], st.session_state.upcoming_limit
+        )
+    
+    if total:
+        st.markdown(cards_html, unsafe_allow_html=True)
+        if total > st.session_state.upcoming_limit:
+            st.caption(f"Showing {st.session_state.upcoming_limit} of {total} upcoming reservations")
+            st.button("Show more", key="upcoming_show_more", on_click=show_more_upcoming)
     else:
         st.info("No upcoming approved reservations.")
     
@@ -1105,8 +2624,557 @@ def public_view(df):
     
     """)
 
+# Static export of the public calendar (see export_public_site): default
+# output directory and number of months, and the SVG calendar cell size
+EXPORT_DIR = "public_site"
+EXPORT_MONTHS = 12
+SVG_CELL_WIDTH, SVG_CELL_HEIGHT = 64, 48
+
+# Page around the exported calendars and upcoming stays
+EXPORT_PAGE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<meta name="viewport" content="width=device-width, initial-scale=1">
+<title>Schieberl Cabin Reservations</title>
+{css}
+</head>
+<body>
+<h1 class="main-header">Schieberl Cabin Reservations</h1>
+<p class="sub-header">Availability as of {today}</p>
+<p>🟢 Reserved · ⚪ Available</p>
+{calendars}
+<h2>📅 Upcoming Reservations</h2>
+{upcoming}
+</body>
+</html>
+"""
+
+def calendar_svg(selected_month, selected_year, status, position):
+    """
+    Static SVG month calendar, drawn like calendar_figure from per-day
+    status and position codes (one entry per day of the month)
+    """
+    grid, status_grid, position_grid = month_grid(selected_month, selected_year, status, position)
+    fills = dict(CALENDAR_COLORSCALE)
+    title = f"{calendar.month_name[selected_month]} {selected_year}"
+    top = 56
+    width, height = 7 * SVG_CELL_WIDTH, top + len(grid) * SVG_CELL_HEIGHT
+    
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+        f'viewBox="0 0 {width} {height}" font-family="sans-serif" role="img" aria-label="{title}">',
+        f'<text x="{width // 2}" y="22" text-anchor="middle" font-size="16" font-weight="bold" '
+        f'fill="#1f2937">{title}</text>',
+    ]
+    for j, label in enumerate(WEEKDAY_LABELS):
+        parts.append(f'<text x="{j * SVG_CELL_WIDTH + SVG_CELL_WIDTH // 2}" y="46" text-anchor="middle" '
+                     f'font-size="12" fill="#6b7280">{label}</text>')
+    
+    # Day cells, colored by status
+    for i, j in zip(*np.nonzero(grid > 0)):
+        x, y = j * SVG_CELL_WIDTH, top + i * SVG_CELL_HEIGHT
+        text_color, font_weight = STATUS_TEXT_STYLES[status_grid[i, j]]
+        parts.append(
+            f'<rect x="{x}" y="{y}" width="{SVG_CELL_WIDTH}" height="{SVG_CELL_HEIGHT}" '
+            f'fill="{fills[STATUS_HEAT[status_grid[i, j]]]}" stroke="#ffffff"/>'
+            f'<text x="{x + SVG_CELL_WIDTH // 2}" y="{y + SVG_CELL_HEIGHT // 2 + 4}" text-anchor="middle" '
+            f'font-size="12" font-weight="{font_weight}" fill="{text_color}">{grid[i, j]}</text>'
+        )
+    
+    # Outlines where reservations start and end
+    left_edges = (position_grid == POSITION_START) | (position_grid == POSITION_SINGLE)
+    right_edges = (position_grid == POSITION_END) | (position_grid == POSITION_SINGLE)
+    for edges, dx in ((left_edges, 0), (right_edges, 1)):
+        for i, j in zip(*np.nonzero(edges & (status_grid != STATUS_NONE))):
+            x, y = (j + dx) * SVG_CELL_WIDTH, top + i * SVG_CELL_HEIGHT
+            parts.append(f'<line x1="{x}" y1="{y}" x2="{x}" y2="{y + SVG_CELL_HEIGHT}" '
+                         f'stroke="black" stroke-width="4"/>')
+    
+    parts.append('</svg>')
+    return "\n".join(parts)
+
+def export_public_site(store, out_dir, first_month, first_year, num_months, today=None):
+    """
+    Pre-render the public calendar for ``num_months`` months and the upcoming
+    approved stays as static files in ``out_dir``: one SVG per month, with a
+    content-hashed name so it can be cached for good, and an index.html
+    showing them.
+    
+    A manifest.json records what the files were built from, so nothing is
+    rendered until the approved stays, the day or the months change; months
+    whose calendar is unchanged keep their file. Files of the previous build
+    that are no longer used are removed.
+    
+    Returns a dict with whether anything changed, the files of the build and
+    the files written.
+    """
+    today = today or date.today()
+    snapshot = get_public_availability(store)
+    stays = snapshot['upcoming']
+    fingerprint = hashlib.blake2b(
+        repr((hash_frame(stays), today.isoformat(), first_month, first_year, num_months)).encode(),
+        digest_size=16
+    ).hexdigest()
+    
+    os.makedirs(out_dir, exist_ok=True)
+    manifest_path = os.path.join(out_dir, "manifest.json")
+    previous = {'fingerprint': None, 'files': []}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            previous = json.load(f)
+    if previous['fingerprint'] == fingerprint and all(
+        os.path.exists(os.path.join(out_dir, name)) for name in previous['files']
+    ):
+        return {'changed': False, 'files': previous['files'], 'written': []}
+    
+    # One calendar per month, cut from a single lookup of the whole range
+    range_start, range_end = month_range(first_month, first_year, num_months)
+    status, position = availability_window(snapshot, range_start, (range_end - range_start).days + 1)
+    files, written, images = [], [], []
+    offset = 0
+    for n in range(num_months):
+        month = (first_month - 1 + n) % 12 + 1
+        year = first_year + (first_month - 1 + n) // 12
+        days = calendar.monthrange(year, month)[1]
+        svg = calendar_svg(month, year, status[offset:offset + days], position[offset:offset + days])
+        offset += days
+        
+        name = f"calendar-{year}-{month:02d}.{hashlib.sha256(svg.encode()).hexdigest()[:12]}.svg"
+        if not os.path.exists(os.path.join(out_dir, name)):
+            write_file_atomic(os.path.join(out_dir, name), svg)
+            written.append(name)
+        files.append(name)
+        images.append(f'<img src="{name}" alt="Availability in {calendar.month_name[month]} {year}">')
+    
+    # Upcoming approved stays from today
+    if 'Check-In' in stays.columns:
+        cards_html, total = render_upcoming_html(snapshot, snapshot['data_version'], today, None, None)
+    else:
+        cards_html, total = "", 0
+    page = EXPORT_PAGE.format(
+        css=PAGE_CSS, today=f"{today:{DISPLAY_DATE_FORMAT}}", calendars="\n".join(images),
+        upcoming=cards_html if total else "<p>No upcoming approved reservations.</p>"
+    )
+    
+    # index.html last, once every file it links to is in place
+    write_file_atomic(os.path.join(out_dir, "index.html"), page)
+    written.append("index.html")
+    files.append("index.html")
+    write_file_atomic(manifest_path, json.dumps({'fingerprint': fingerprint, 'files': files}, indent=2))
+    
+    # Drop the files of the previous build this one no longer uses
+    for name in set(previous['files']) - set(files):
+        path = os.path.join(out_dir, name)
+        if os.path.exists(path):
+            os.remove(path)
+    return {'changed': True, 'files': files, 'written': written}
+
+def write_file_atomic(path, content):
+    """Write a text file through a temporary file, so readers never see it half written"""
+    temp_path = f"{path}.tmp"
+    with open(temp_path, "w", encoding="utf-8") as f:
+        f.write(content)
+    os.replace(temp_path, path)
+
+# Public iCalendar feed of the approved stays (see get_ics_feed) and the
+# local HTTP server for calendar clients and the JSON API (see public_request_handler)
+ICS_PRODUCT_ID = "-//Schieberl Cabin//Reservations//EN"
+ICS_CALENDAR_NAME = "Schieberl Cabin"
+SERVER_PORT = 8502
+
+@st.cache_resource
+def get_ics_feeds():
+    """Process-wide latest ICS feed of each store, by store key"""
+    return {'feeds': {}, 'lock': threading.Lock()}
+
+def get_ics_feed(store):
+    """
+    Public ICS feed of the store's approved stays: a dict with the ``body``
+    (bytes), its ``etag`` and ``last_modified`` time.
+    
+    Checked once per data version of the store, and only rebuilt when the
+    approved stays themselves change; other changes (new requests, denials)
+    keep the feed, its ETag and Last-Modified time.
+    """
+    snapshot = get_public_availability(store)
+    registry = get_ics_feeds()
+    with registry['lock']:
+        feed = registry['feeds'].get(store.key)
+        if feed is not None and feed['data_version'] == snapshot['data_version']:
+            return feed
+        
+        stays = snapshot['upcoming']
+        if 'Check-In' not in stays.columns:
+            stays = pd.DataFrame({'Check-In': pd.Series(dtype='datetime64[ns]'),
+                                  'Check-Out': pd.Series(dtype='datetime64[ns]')})
+        approved_version = hash_frame(stays[['Check-In', 'Check-Out']])
+        if feed is None or feed['approved_version'] != approved_version:
+            # HTTP dates have a resolution of seconds
+            generated_at = datetime.now(timezone.utc).replace(microsecond=0)
+            feed = {
+                'body': build_ics(stays, generated_at).encode(),
+                'etag': f'"{approved_version}"',
+                'last_modified': generated_at,
+                'approved_version': approved_version,
+            }
+        feed = {**feed, 'data_version': snapshot['data_version']}
+        registry['feeds'][store.key] = feed
+        return feed
+
+def build_ics(stays, generated_at):
+    """
+    iCalendar text with one all-day "Reserved" event per stay, covering its
+    nights (see stay_nights). Guest details are left out.
+    """
+    start, end = stay_nights(stays)
+    valid = start >= 0
+    dates = pd.DataFrame({
+        'start': pd.Series(start[valid].astype('datetime64[D]')).dt.strftime('%Y%m%d'),
+        'end': pd.Series(end[valid].astype('datetime64[D]')).dt.strftime('%Y%m%d'),
+    })
+    # Stable ids: the same stay keeps its id while the approved set changes around it
+    occurrence = dates.groupby(['start', 'end']).cumcount().astype(str)
+    stamp = generated_at.strftime('%Y%m%dT%H%M%SZ')
+    events = (
+        'BEGIN:VEVENT\r\nUID:' + dates['start'] + '-' + dates['end'] + '-' + occurrence
+        + '@schieberl-cabin\r\nDTSTAMP:' + stamp
+        + '\r\nDTSTART;VALUE=DATE:' + dates['start'] + '\r\nDTEND;VALUE=DATE:' + dates['end']
+        + '\r\nSUMMARY:Reserved\r\nTRANSP:OPAQUE\r\nEND:VEVENT\r\n'
+    )
+    return (
+        f"BEGIN:VCALENDAR\r\nVERSION:2.0\r\nPRODID:{ICS_PRODUCT_ID}\r\nCALSCALE:GREGORIAN\r\n"
+        f"METHOD:PUBLISH\r\nX-WR-CALNAME:{ICS_CALENDAR_NAME}\r\n"
+        + "".join(events) + "END:VCALENDAR\r\n"
+    )
+
+def not_modified(headers, etag, last_modified):
+    """
+    Whether a conditional GET with the request ``headers`` can be answered
+    with 304 Not Modified. If-None-Match takes precedence over
+    If-Modified-Since (checked only with a ``last_modified`` time), as in
+    RFC 9110.
+    """
+    if_none_match = headers.get('If-None-Match')
+    if if_none_match is not None:
+        tags = [tag.strip().removeprefix('W/') for tag in if_none_match.split(',')]
+        return '*' in tags or etag in tags
+    
+    if_modified_since = headers.get('If-Modified-Since')
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        return last_modified <= parsedate_to_datetime(if_modified_since)
+    except (TypeError, ValueError):
+        return False
+
+# JSON availability API served next to the feed: cached gzip responses per
+# data version, and the longest range a single query may cover
+API_CACHE_SIZE = 512
+API_MAX_NIGHTS = 3 * 366
+API_MAX_MONTHS = 24
+
+@st.cache_resource(max_entries=NORMALIZED_CACHE_SIZE, show_spinner=False)
+def build_night_index(_snapshot, data_version):
+    """
+    Booked nights of the approved stays in a public availability snapshot,
+    as one flag per night from the first booked night (``origin``, a day
+    number like stay_nights). Cached per snapshot version.
+    """
+    stays = _snapshot['upcoming']
+    start, end = stay_nights(stays) if 'Check-In' in stays.columns else (np.empty(0, np.int64),) * 2
+    valid = start >= 0
+    start, end = start[valid], end[valid]
+    if len(start) == 0:
+        return {'origin': 0, 'booked': np.zeros(0, dtype=bool)}
+    
+    # +1 where a stay starts and -1 where it ends; nights with a positive sum are booked
+    origin = int(start.min())
+    changes = np.zeros(int(end.max()) - origin + 1, dtype=np.int32)
+    np.add.at(changes, start - origin, 1)
+    np.add.at(changes, end - origin, -1)
+    return {'origin': origin, 'booked': np.cumsum(changes)[:-1] > 0}
+
+def booked_nights(index, start, end):
+    """Day numbers of the booked nights from ``start`` up to (not including) ``end``"""
+    lo = max(start - index['origin'], 0)
+    hi = min(end - index['origin'], len(index['booked']))
+    if hi <= lo:
+        return np.empty(0, dtype=np.int64)
+    return np.flatnonzero(index['booked'][lo:hi]) + index['origin'] + lo
+
+def day_strings(days):
+    """ISO dates of day numbers"""
+    return np.datetime_as_string(np.asarray(days, dtype=np.int64).astype('datetime64[D]')).tolist()
+
+def parse_day(value, name):
+    """Day number of an ISO date query parameter"""
+    try:
+        return (date.fromisoformat(value) - date(1970, 1, 1)).days
+    except (TypeError, ValueError):
+        raise ValueError(f"{name} must be a date like 2026-07-01")
+
+def api_availability(index, params):
+    """
+    Whether the cabin is free for the nights from ``start`` up to the
+    check-out date ``end``, and which of those nights are booked
+    """
+    start = parse_day(params.get('start'), 'start')
+    end = parse_day(params.get('end'), 'end')
+    if not 0 < end - start <= API_MAX_NIGHTS:
+        raise ValueError(f"end must be 1 to {API_MAX_NIGHTS} days after start")
+    booked = booked_nights(index, start, end)
+    return {'start': day_strings([start])[0], 'end': day_strings([end])[0],
+            'available': len(booked) == 0, 'booked_nights': day_strings(booked)}
+
+def api_months(index, params):
+    """Booked and available nights of ``months`` months from the month ``start``"""
+    try:
+        first = datetime.strptime(params.get('start', ''), '%Y-%m')
+        num_months = int(params.get('months', 1))
+    except ValueError:
+        raise ValueError("start must be a month like 2026-07 and months a number")
+    if not 1 <= num_months <= API_MAX_MONTHS:
+        raise ValueError(f"months must be 1 to {API_MAX_MONTHS}")
+    
+    months = []
+    for n in range(num_months):
+        month = (first.month - 1 + n) % 12 + 1
+        year = first.year + (first.month - 1 + n) // 12
+        start = parse_day(f"{year}-{month:02d}-01", 'start')
+        nights = calendar.monthrange(year, month)[1]
+        booked = booked_nights(index, start, start + nights)
+        months.append({'month': f"{year}-{month:02d}", 'nights': nights, 'booked': len(booked),
+                       'available': nights - len(booked), 'booked_nights': day_strings(booked)})
+    return {'months': months}
+
+# API endpoints and the query parameters they read
+API_ROUTES = {
+    '/api/availability': (api_availability, ('start', 'end')),
+    '/api/months': (api_months, ('start', 'months')),
+}
+
+@st.cache_resource
+def get_api_cache():
+    """Process-wide LRU of encoded API responses"""
+    return new_lru_cache()
+
+def get_api_response(store, path, query):
+    """
+    Gzip-compressed JSON response of an API endpoint (see API_ROUTES), as a
+    dict with the HTTP ``status``, ``body`` and ``etag``. Responses are
+    cached per data version and query; bad queries get a 400 with an error.
+    """
+    handler, names = API_ROUTES[path]
+    values = parse_qs(query)
+    params = {name: values[name][-1] for name in names if name in values}
+    snapshot = get_public_availability(store)
+    key = (store.key, snapshot['data_version'], path, tuple(sorted(params.items())))
+    
+    cache = get_api_cache()
+    response = lru_get(cache, key)
+    if response is None:
+        try:
+            status, payload = 200, handler(build_night_index(snapshot, snapshot['data_version']), params)
+        except ValueError as e:
+            status, payload = 400, {'error': str(e)}
+        body = json.dumps(payload, separators=(',', ':')).encode()
+        response = {
+            'status': status,
+            'body': gzip.compress(body, mtime=0),
+            'etag': f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"',
+        }
+        lru_put(cache, key, response, API_CACHE_SIZE)
+    return response
+
+def public_request_handler():
+    """Request handler class of the public server, defined on first use so pages never import http.server"""
+    from http.server import BaseHTTPRequestHandler
+    
+    class PublicRequestHandler(BaseHTTPRequestHandler):
+        """
+        Serves the public data of ``server.store``: the ICS feed at
+        /calendar.ics, with ETag/Last-Modified validators so polling clients
+        mostly get 304s, and the JSON API (see API_ROUTES)
+        """
+        server_version = "SchieberlCabin"
+        # Keep-alive for pollers; headers and body go out as separate writes, so
+        # without TCP_NODELAY every response waits on a delayed ACK
+        protocol_version = "HTTP/1.1"
+        disable_nagle_algorithm = True
+        
+        def do_GET(self):
+            self.respond(head_only=False)
+        
+        def do_HEAD(self):
+            self.respond(head_only=True)
+        
+        def respond(self, head_only):
+            url = urlsplit(self.path)
+            if url.path != '/calendar.ics' and url.path not in API_ROUTES:
+                self.send_error(404)
+                return
+            try:
+                if url.path == '/calendar.ics':
+                    feed = get_ics_feed(self.server.store)
+                else:
+                    response = get_api_response(self.server.store, url.path, url.query)
+            except Exception as e:
+                self.send_error(503, f"Reservations unavailable: {e}")
+                return
+            
+            if url.path == '/calendar.ics':
+                self.send_body(head_only, 200, feed['body'], 'text/calendar; charset=utf-8', feed['etag'],
+                               feed['last_modified'])
+            else:
+                self.send_body(head_only, response['status'], response['body'], 'application/json',
+                               response['etag'], gzipped=True)
+        
+        def send_body(self, head_only, status, body, content_type, etag, last_modified=None, gzipped=False):
+            modified = status != 200 or not not_modified(self.headers, etag, last_modified)
+            # The few clients without gzip get the body decompressed
+            if gzipped and 'gzip' not in self.headers.get('Accept-Encoding', ''):
+                body, gzipped = gzip.decompress(body), False
+            
+            self.send_response(status if modified else 304)
+            self.send_header('ETag', etag)
+            if last_modified is not None:
+                self.send_header('Last-Modified', format_datetime(last_modified, usegmt=True))
+            self.send_header('Cache-Control', 'no-cache')
+            self.send_header('Vary', 'Accept-Encoding')
+            if modified:
+                self.send_header('Content-Type', content_type)
+                if gzipped:
+                    self.send_header('Content-Encoding', 'gzip')
+                self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            if modified and not head_only:
+                self.wfile.write(body)
+    
+    return PublicRequestHandler
+
+def serve_public(store, host, port):
+    """Serve the store's public feed and API until interrupted"""
+    from http.server import ThreadingHTTPServer
+    
+    server = ThreadingHTTPServer((host, port), public_request_handler())
+    server.store = store
+    print(f"Serving http://{host}:{port}/calendar.ics and /api/ from {store.name}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+def start_profile_run():
+    """
+    Start profiling this rerun if an admin turned profiling on. Phases are
+    recorded by profile_phase; with cProfile on, the whole rerun is profiled.
+    """
+    # A rerun cut short (st.rerun, st.stop) never finished its profile
+    stale = st.session_state.pop('profile_run', None)
+    if stale and stale['profiler'] is not None:
+        stale['profiler'].disable()
+    
+    if not (st.session_state.admin_mode and st.session_state.profiling):
+        return
+    
+    run = {'phases': {}, 'started': time.perf_counter(), 'profiler': None}
+    if st.session_state.get('profile_cprofile'):
+        import cProfile
+        
+        run['profiler'] = cProfile.Profile()
+        run['profiler'].enable()
+    st.session_state.profile_run = run
+
+def profile_phase(name):
+    """
+    Time a phase of the current rerun under ``name`` when profiling is on.
+    Returns a do-nothing context otherwise, so it costs nothing when off.
+    """
+    run = st.session_state.get('profile_run')
+    if run is None:
+        return nullcontext()
+    return timed(run['phases'], name)
+
+def finish_profile_run():
+    """
+    Stop profiling this rerun and add its phase times to the rolling history
+    (the last PROFILE_HISTORY_SIZE reruns). Only the latest cProfile run is
+    kept, as its top functions and a .prof dump.
+    """
+    run = st.session_state.pop('profile_run', None)
+    if run is None:
+        return
+    
+    total = time.perf_counter() - run['started']
+    entry = {'Run': datetime.now().strftime('%H:%M:%S'), **run['phases'],
+             'Other': max(total - sum(run['phases'].values()), 0.0), 'Total': total}
+    if run['profiler'] is not None:
+        run['profiler'].disable()
+        run['profiler'].create_stats()
+        st.session_state.profile_functions = {
+            'Run': entry['Run'],
+            'top': top_profile_functions(run['profiler'].stats),
+            'dump': marshal.dumps(run['profiler'].stats),
+        }
+    
+    if 'profile_history' not in st.session_state:
+        st.session_state.profile_history = deque(maxlen=PROFILE_HISTORY_SIZE)
+    st.session_state.profile_history.append(entry)
+
+def top_profile_functions(stats, limit=PROFILE_TOP_FUNCTIONS):
+    """The ``limit`` functions with the most cumulative time in raw cProfile stats"""
+    import pstats
+    
+    top = sorted(stats.items(), key=lambda item: item[1][3], reverse=True)[:limit]
+    return pd.DataFrame([
+        {'Function': pstats.func_std_string(func), 'Calls': calls, 'Own ms': own * 1000,
+         'Cumulative ms': cumulative * 1000}
+        for func, (_, calls, own, cumulative, _) in top
+    ])
+
+def render_profile_panel():
+    """Sidebar breakdown of the last profiled rerun and the rerun history"""
+    history = st.session_state.get('profile_history')
+    if not history:
+        return
+    
+    latest = history[-1]
+    with st.sidebar.expander("🔬 Rerun profile", expanded=True):
+        phases = {phase: seconds for phase, seconds in latest.items() if phase not in ('Run', 'Total')}
+        breakdown = pd.DataFrame({
+            'Phase': list(phases),
+            'ms': [seconds * 1000 for seconds in phases.values()],
+            'Share': [seconds / latest['Total'] for seconds in phases.values()],
+        }).sort_values('ms', ascending=False)
+        st.caption(f"Rerun at {latest['Run']}: {latest['Total'] * 1000:.0f} ms")
+        st.dataframe(breakdown, hide_index=True, use_container_width=True,
+                     column_config={'ms': st.column_config.NumberColumn(format="%.1f"),
+                                    'Share': st.column_config.ProgressColumn(min_value=0, max_value=1)})
+        
+        # Phase times of the last reruns, in ms
+        runs = pd.DataFrame([{k: v for k, v in entry.items() if k != 'Total'} for entry in history])
+        runs = runs.set_index('Run').fillna(0.0) * 1000
+        st.caption(f"Last {len(runs)} reruns (ms)")
+        st.bar_chart(runs)
+        
+        profiled = st.session_state.get('profile_functions')
+        if profiled:
+            # Top functions of the last cProfile run, and all of it as a .prof file for pstats/snakeviz
+            st.caption(f"Top functions of the rerun at {profiled['Run']}")
+            st.dataframe(profiled['top'], hide_index=True, use_container_width=True,
+                         column_config={'Own ms': st.column_config.NumberColumn(format="%.1f"),
+                                        'Cumulative ms': st.column_config.NumberColumn(format="%.1f")})
+            st.download_button("Download .prof", profiled['dump'],
+                               file_name=f"rerun-{profiled['Run'].replace(':', '')}.prof",
+                               key="profile_download")
+
 def main():
     """Main application"""
+    setup_page()
+    start_profile_run()
     
     # Sidebar
     with st.sidebar:
@@ -1126,6 +3194,20 @@ def main():
         # View selector
         if st.session_state.admin_mode:
             view_mode = st.radio("View Mode", ["Public Calendar", "Admin Panel"])
+            st.toggle("Optimistic updates", key="optimistic_updates",
+                      help="Show status changes immediately and save them to Google Sheets in the background")
+            st.toggle("Profile reruns", key="profiling",
+                      help="Time each phase of a rerun and keep a history of the last reruns")
+            if st.session_state.profiling:
+                st.checkbox("Capture cProfile stats", key="profile_cprofile",
+                            help="Profile every function call of the rerun (slower)")
+            
+            # Refresh a local store from the sheet it syncs to
+            store = get_reservation_store()
+            sync_store = getattr(store, 'sync_store', None)
+            if sync_store is not None and st.button(f"⬇️ Import from {sync_store.name}"):
+                imported = store.import_reservations(load_google_sheets_data(sync_store))
+                st.success(f"Imported {imported} reservations into {store.name}")
         else:
             view_mode = "Public Calendar"
         
@@ -1140,14 +3222,32 @@ def main():
         4. **Everyone** can view availability
         """)
     
-    # Load data
-    df = load_google_sheets_data()
-    
     # Main content
+    store = get_reservation_store()
+    health_slot = st.empty()
     if st.session_state.admin_mode and view_mode == "Admin Panel":
-        admin_panel(df)
+        admin_panel(store)
     else:
-        public_view(df)
+        public_view(store)
+    render_data_health(store, health_slot)
+    
+    # Rerun profile for admins who turned profiling on
+    finish_profile_run()
+    if st.session_state.admin_mode and st.session_state.profiling:
+        render_profile_panel()
+    
+    # Per-column normalization timings for admins
+    if st.session_state.admin_mode and st.session_state.get('load_timings'):
+        with st.sidebar.expander("⏱️ Data load timings"):
+            for column, seconds in st.session_state.load_timings.items():
+                st.write(f"**{column}:** {seconds * 1000:.1f} ms")
+            for label, cache in (("Normalized data", get_normalized_cache()),
+                                 ("Calendar figure", get_figure_cache())):
+                stats = lru_stats(cache)
+                st.caption(
+                    f"{label} cache: {stats['hits']} hits, {stats['misses']} misses "
+                    f"({stats['hit_ratio']:.0%}), {stats['entries']} kept"
+                )
     
     # Footer
     st.divider()
@@ -1157,5 +3257,61 @@ def main():
     </div>
     """, unsafe_allow_html=True)
 
+def cli(argv=None):
+    """
+    Command-line entry point, used when app.py runs without Streamlit:
+    
+        python app.py export --months 6 --out public_site
+        python app.py serve --port 8502
+    """
+    import argparse
+    
+    parser = argparse.ArgumentParser(prog="app.py", description="Schieberl Cabin reservations")
+    store_options = argparse.ArgumentParser(add_help=False)
+    store_options.add_argument("--sqlite", metavar="PATH",
+                               help="use this SQLite database instead of the configured store")
+    commands = parser.add_subparsers(dest="command", required=True)
+    
+    export = commands.add_parser("export", parents=[store_options],
+                                 help="pre-render the public calendar as static HTML/SVG files")
+    export.add_argument("--out", default=EXPORT_DIR, help="output directory")
+    export.add_argument("--start", type=lambda value: datetime.strptime(value, "%Y-%m"), metavar="YYYY-MM",
+                        help="first month (default: this month)")
+    export.add_argument("--months", type=int, default=EXPORT_MONTHS, help="number of months")
+    
+    serve = commands.add_parser("serve", parents=[store_options],
+                                help="serve the public ICS feed and JSON availability API over HTTP")
+    serve.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    serve.add_argument("--port", type=int, default=SERVER_PORT, help="port to listen on")
+    args = parser.parse_args(argv)
+    
+    if args.sqlite and not os.path.exists(args.sqlite):
+        parser.error(f"no SQLite database at {args.sqlite}")
+    if args.command == "export" and args.months < 1:
+        parser.error("--months must be at least 1")
+    store = SQLiteStore(args.sqlite) if args.sqlite else get_reservation_store()
+    
+    try:
+        if args.command == "serve":
+            # Fail now rather than on the first request if the store can't be read
+            store.data_version()
+            serve_public(store, args.host, args.port)
+            return 0
+        start = args.start or datetime.now()
+        result = export_public_site(store, args.out, start.month, start.year, args.months)
+    except Exception as e:
+        print(f"Error loading reservations from {store.name}: {e}", file=sys.stderr)
+        return 1
+    
+    if result['changed']:
+        print(f"Exported {args.months} month(s) to {args.out}: wrote {', '.join(result['written'])}")
+    else:
+        print(f"Approved stays unchanged; {args.out} is up to date")
+    return 0
+
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # `streamlit run app.py` serves the app; `python app.py ...` runs the command line
+    if st.runtime.exists():
+        main()
+    else:
+        sys.exit(cli())
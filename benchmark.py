@@ -0,0 +1,327 @@
+"""
+Benchmarks for the load and render hot paths of the reservation app.
+
+Generates synthetic, deliberately messy reservation sheets (mixed date
+formats, blank cells, free-form phone numbers) and times each stage against
+a stand-in for the Google Sheets connection, recording wall time and peak
+memory. Results can be saved as a baseline and later runs compared to it:
+
+    python benchmark.py --save-baseline
+    python benchmark.py                    # flags regressions, exit code 1
+    python benchmark.py --sizes 100 10000  # skip the 1M row run
+
+Every run also checks the cold start, in fresh interpreters, against a
+fixed budget (see STARTUP_BUDGET).
+"""
+import argparse
+import gc
+import json
+import os
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import streamlit.logger
+
+# The app runs outside a Streamlit server here; keep its bare-mode warnings
+# quiet, including the ones its caches log on import
+streamlit.logger.set_log_level("error")
+
+import app
+
+SIZES = [100, 10_000, 1_000_000]
+BASELINE_PATH = "benchmark_baseline.json"
+
+# A stage is a regression when slower than the baseline by this factor,
+# ignoring differences below the noise floor (in seconds)
+TOLERANCE = 1.5
+NOISE_FLOOR = 0.005
+
+# Timed repeats per size; the best run is kept
+REPEATS = {100: 7, 10_000: 5}
+
+# Cold start budget in seconds: importing app.py on top of the frameworks it
+# can't start without (Streamlit, pandas, numpy), then the first page a
+# visitor sees (load, normalize and the public calendar figure). The
+# frameworks alone take 0.6-0.9 s on a dev machine and aren't budgeted; the
+# app's own import measures about 20 ms, where importing the Sheets client
+# and Plotly up front used to add 0.4-0.5 s.
+STARTUP_BUDGET = {'import': 0.1, 'first_render': 0.5}
+STARTUP_REPEATS = 3
+
+# Run in a fresh interpreter, so nothing is imported or cached yet
+STARTUP_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import numpy, pandas, streamlit
+frameworks = time.perf_counter()
+import app
+imported = time.perf_counter()
+
+import streamlit.logger
+from datetime import date
+from benchmark import BenchConnection, make_raw_reservations
+streamlit.logger.set_log_level("error")
+store = app.GSheetsStore(BenchConnection(make_raw_reservations(100)))
+
+rendering = time.perf_counter()
+snapshot = app.get_public_availability(store)
+app.cached_public_calendar(snapshot, date.today().month, date.today().year)
+rendered = time.perf_counter()
+print(json.dumps({'frameworks': frameworks - started, 'import': imported - frameworks,
+                  'first_render': rendered - rendering}))
+"""
+
+
+class BenchConnection:
+    """Stand-in for the Google Sheets connection serving a fixed raw frame"""
+
+    def __init__(self, raw_df):
+        self.raw_df = raw_df
+
+    def read(self, ttl=None):
+        return self.raw_df.copy()
+
+    def update(self, data=None):
+        self.raw_df = data
+
+
+def make_raw_reservations(num_rows, seed=0):
+    """
+    Synthetic raw sheet with ``num_rows`` reservations spread over a few
+    years around today, with the kind of mess a form-fed sheet collects.
+    """
+    rng = np.random.default_rng(seed)
+
+    # Stays of 1-7 nights, mostly in the sheet's date format
+    first_day = np.datetime64(date.today(), 'D') - 365
+    check_in = first_day + rng.integers(0, 3 * 365, num_rows)
+    check_out = check_in + rng.integers(1, 8, num_rows)
+    date_style = rng.choice(['sheet', 'iso', 'blank'], num_rows, p=[0.93, 0.05, 0.02])
+
+    # Free-form phone numbers
+    digits = pd.Series(rng.integers(2_000_000_000, 9_999_999_999, num_rows)).astype(str)
+    phone_style = rng.choice(['plain', 'dashed', 'country', 'dotted', 'blank'], num_rows)
+    phones = np.select(
+        [phone_style == 'dashed', phone_style == 'country', phone_style == 'dotted', phone_style == 'blank'],
+        ["(" + digits.str[:3] + ") " + digits.str[3:6] + "-" + digits.str[6:],
+         "+1 " + digits.str[:3] + "-" + digits.str[3:6] + "-" + digits.str[6:],
+         digits.str[:3] + "." + digits.str[3:6] + "." + digits.str[6:],
+         ""],
+        digits
+    )
+
+    guests = rng.integers(1, 9, num_rows).astype(str).astype(object)
+    guests[rng.random(num_rows) < 0.02] = ""
+    guests[rng.random(num_rows) < 0.01] = "two"
+
+    status = rng.choice(np.array(['Approved', 'Pending', 'Denied', '', None], dtype=object),
+                        num_rows, p=[0.45, 0.3, 0.15, 0.05, 0.05])
+    notes = np.where(rng.random(num_rows) < 0.2, "Bringing the dog", None)
+    guest_ids = pd.Series(np.arange(num_rows)).astype(str)
+
+    return pd.DataFrame({
+        'Timestamp': format_sheet_dates(check_in - 30, date_style) + " 10:15:00",
+        'Guest Name': "Guest " + guest_ids,
+        'Email Address': "guest" + guest_ids + "@example.com",
+        'Phone Number': phones,
+        'Check-In': format_sheet_dates(check_in, date_style),
+        'Check-Out': format_sheet_dates(check_out, date_style),
+        'Number of Guests': guests,
+        'Notes': notes,
+        'Status': status,
+    })
+
+def format_sheet_dates(days, styles):
+    """Format day numbers as sheet (M/D/YYYY) or ISO dates, or blanks"""
+    stamps = pd.DatetimeIndex(days)
+    sheet = (pd.Series(stamps.month).astype(str) + "/" + pd.Series(stamps.day).astype(str)
+             + "/" + pd.Series(stamps.year).astype(str))
+    iso = pd.Series(np.datetime_as_string(days, unit='D'))
+    return pd.Series(np.select([styles == 'iso', styles == 'blank'], [iso, ""], sheet))
+
+
+def bench_normalize(raw_df, df):
+    app.normalize_reservations(raw_df)
+
+def bench_load(raw_df, df):
+    app.get_normalized_cache.clear()
+    app.get_store_health_registry.clear()
+    app.load_google_sheets_data(app.GSheetsStore(BenchConnection(raw_df)))
+
+def bench_phone_scalar(raw_df, df):
+    raw_df['Phone Number'].map(app.format_phone_number)
+
+def bench_phone_vectorized(raw_df, df):
+    app.format_phone_numbers(raw_df['Phone Number'])
+
+def bench_calendar_admin(raw_df, df):
+    app.build_occupancy_index.clear()
+    today = date.today()
+    app.create_calendar_view(df, today.month, today.year, is_admin=True)
+
+def bench_filter_index(raw_df, df):
+    app.build_filter_index.clear()
+    app.build_filter_index(df, app.get_data_version(df))
+
+def bench_admin_filter(raw_df, df):
+    # The All Reservations table filters on a built index: status, dates, search and all three
+    index = app.build_filter_index(df, app.get_data_version(df))
+    today = date.today()
+    next_year = today.replace(year=today.year + 1)
+    for start, end, statuses, text in ((None, None, ['Pending'], ''),
+                                       (today, next_year, None, ''),
+                                       (None, None, None, 'guest 12'),
+                                       (today, next_year, ['Approved'], 'dog')):
+        positions = app.filter_positions(index, start, end, statuses, text)
+        df.iloc[positions]
+
+def bench_conflicts(raw_df, df):
+    app.build_overlap_index.clear()
+    app.reservation_conflicts(df, app.build_overlap_index(df, app.get_data_version(df)))
+
+def bench_public_upcoming(raw_df, df):
+    app.get_store_health_registry.clear()
+    app.build_public_availability.clear()
+    app.render_upcoming_html.clear()
+    snapshot = app.get_public_availability(app.GSheetsStore(BenchConnection(raw_df)))
+    app.render_upcoming_html(snapshot, snapshot['data_version'], date.today(), None, app.UPCOMING_PAGE_SIZE)
+
+STAGES = {
+    'load': bench_load,
+    'normalize': bench_normalize,
+    'phone_scalar': bench_phone_scalar,
+    'phone_vectorized': bench_phone_vectorized,
+    'calendar_admin': bench_calendar_admin,
+    'filter_index': bench_filter_index,
+    'admin_filter': bench_admin_filter,
+    'conflicts': bench_conflicts,
+    'public_upcoming': bench_public_upcoming,
+}
+
+
+def measure(stage, raw_df, df, repeats):
+    """Best wall time of ``repeats`` runs and the peak memory of one traced run"""
+    best = float('inf')
+    for _ in range(repeats):
+        # Like timeit, keep garbage collection out of the timed runs
+        gc.collect()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            stage(raw_df, df)
+            best = min(best, time.perf_counter() - started)
+        finally:
+            gc.enable()
+
+    # Traced separately: tracemalloc slows allocation-heavy code down
+    tracemalloc.start()
+    try:
+        stage(raw_df, df)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {'seconds': best, 'peak_mb': peak / 2 ** 20}
+
+def measure_startup(repeats=STARTUP_REPEATS):
+    """
+    Best cold start phase times of ``repeats`` fresh interpreters. The
+    budgeted phases are returned in the results format; the frameworks'
+    import time is only printed.
+    """
+    best = {}
+    for _ in range(repeats):
+        output = subprocess.run([sys.executable, "-c", STARTUP_SCRIPT], capture_output=True, text=True,
+                                check=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+        times = json.loads(output.stdout.strip().splitlines()[-1])
+        best = {phase: min(best.get(phase, float('inf')), seconds) for phase, seconds in times.items()}
+    for phase, seconds in best.items():
+        print(f"{'startup':>14}  {phase:<18} {seconds * 1000:>10.1f} ms", flush=True)
+    return {phase: {'seconds': best[phase], 'peak_mb': 0.0} for phase in STARTUP_BUDGET}
+
+def over_budget(startup, budget=STARTUP_BUDGET):
+    """Cold start phases slower than their budget"""
+    return [(phase, budget[phase], result['seconds'])
+            for phase, result in startup.items() if result['seconds'] > budget[phase]]
+
+def run_benchmarks(sizes, stages):
+    """Time every stage at every size. Returns {size: {stage: result}}."""
+    results = {}
+    for num_rows in sizes:
+        raw_df = make_raw_reservations(num_rows)
+        # Normalized like the app does, carrying its data version so the
+        # stages don't re-hash the frame inside their timed runs
+        df, _ = app.normalize_reservations_cached(raw_df)
+        results[str(num_rows)] = {}
+        for name in stages:
+            result = measure(STAGES[name], raw_df, df, REPEATS.get(num_rows, 1))
+            results[str(num_rows)][name] = result
+            print(f"{num_rows:>9} rows  {name:<18} {result['seconds'] * 1000:>10.1f} ms"
+                  f"  {result['peak_mb']:>8.1f} MB", flush=True)
+    return results
+
+def find_regressions(results, baseline, tolerance=TOLERANCE):
+    """Stages slower than their baseline time by more than ``tolerance``"""
+    regressions = []
+    for size, stages in results.items():
+        for name, result in stages.items():
+            previous = baseline.get(size, {}).get(name)
+            if previous is None:
+                continue
+            limit = max(previous['seconds'] * tolerance, previous['seconds'] + NOISE_FLOOR)
+            if result['seconds'] > limit:
+                regressions.append((size, name, previous['seconds'], result['seconds']))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES,
+                        help="reservation counts to generate")
+    parser.add_argument("--stages", nargs="+", choices=list(STAGES), default=list(STAGES),
+                        help="stages to run")
+    parser.add_argument("--baseline", default=BASELINE_PATH,
+                        help="baseline file to compare with or save to")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="store this run as the new baseline")
+    parser.add_argument("--tolerance", type=float, default=TOLERANCE,
+                        help="slowdown factor that counts as a regression")
+    parser.add_argument("--skip-startup", action="store_true",
+                        help="don't measure the cold start")
+    args = parser.parse_args(argv)
+
+    results = {}
+    if not args.skip_startup:
+        results['startup'] = measure_startup()
+    results.update(run_benchmarks(args.sizes, args.stages))
+    slow_starts = over_budget(results.get('startup', {}))
+    for phase, budget, seconds in slow_starts:
+        print(f"OVER BUDGET startup {phase}: {seconds * 1000:.1f} ms (budget {budget * 1000:.0f} ms)")
+
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+        print(f"Baseline saved to {args.baseline}")
+        return 1 if slow_starts else 0
+
+    if not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 1 if slow_starts else 0
+
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    regressions = find_regressions(results, baseline, args.tolerance)
+    for size, name, before, after in regressions:
+        where = size if size == 'startup' else f"{size} rows"
+        print(f"REGRESSION {name} at {where}: {before * 1000:.1f} ms -> {after * 1000:.1f} ms")
+    if not regressions:
+        print("No regressions against the baseline")
+    return 1 if regressions or slow_starts else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())